@@ -6,50 +6,237 @@ Usage:
     python -m mkdocs_cdoc.convert src/
     python -m mkdocs_cdoc.convert src/engine.h --dry-run
     python -m mkdocs_cdoc.convert src/ --ext .c .h --backup
+    python -m mkdocs_cdoc.convert src/ --jobs 4
+    python -m mkdocs_cdoc.convert src/ --cache .cdoc-convert.json
 """
 
-import argparse
+import contextlib
+import functools
+import json
+import mmap
 import os
-import re
 import shutil
 import sys
+import tempfile
 
-from .parser import gtkdoc_to_rst
+from . import __version__
+from .parser import _PARALLEL_MIN_FILES, _POOL_ERRORS, _process_pool, gtkdoc_to_rst
 
-_BLOCK_COMMENT_RE = re.compile(r"(/\*\*.*?\*/)", re.DOTALL)
+# Convert each distinct comment body once per process
+_convert_body = functools.lru_cache(maxsize=65536)(gtkdoc_to_rst)
 
 
-def convert_file(path, dry_run=False, backup=False):
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        original = f.read()
+def _splice(data, opener, closer, convert):
+    # Replace the body of every opener...closer block; works on str or bytes
+    out = []
+    pos = 0  # start of the next segment to copy through
+    scan = 0  # where to look for the next opener; a block's "*/" can't reopen
+    find = data.find
+    skip = len(opener)
+    while True:
+        start = find(opener, scan)
+        if start == -1:
+            break
+        end = find(closer, start + skip)
+        if end == -1:
+            break
+        out.append(data[pos : start + skip])
+        out.append(convert(data[start + skip : end]))
+        pos = end
+        scan = end + len(closer)
+    out.append(data[pos:])
+    return data[:0].join(out)
+
+
+def convert_text(text):
+    """Convert gtk-doc markup inside every ``/** ... */`` block of text."""
+    return _splice(text, "/**", "*/", _convert_body)
+
+
+def _convert_body_bytes(body):
+    text = body.decode("utf-8", errors="replace")
+    result = _convert_body(text)
+    # Hand back the original bytes when nothing changed, so undecodable
+    # bytes in untouched comments survive the round trip
+    return body if result == text else result.encode("utf-8")
+
+
+def convert_bytes(data):
+    """Like convert_text, but on raw UTF-8 bytes.
+
+    Only the comment bodies are decoded; code between them is copied
+    through as bytes, never decoded or re-encoded.
+    """
+    return _splice(data, b"/**", b"*/", _convert_body_bytes)
+
+
+def _read_source(path):
+    """Return the raw contents of path, or None if it has no doc comments.
+
+    The file is probed through a read-only mapping first, so sources
+    without any ``/** ... */`` block are never copied.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Skip files without any doc comment
+            if mm.find(b"/**") == -1:
+                return None
+            return mm[:]
+
+
+def _backup(path):
+    """Keep the current contents of path as path + ".bak".
 
-    def convert_match(m):
-        full = m.group(1)
-        if not full.startswith("/**"):
-            return full
-        prefix = full[:3]
-        suffix = full[-2:]
-        inner = full[3:-2]
-        converted = gtkdoc_to_rst(inner)
-        return prefix + converted + suffix
+    A hard link costs no data copy, and stays pointing at the old contents
+    because _write_source replaces the file by rename rather than writing
+    in place. Falls back to a full copy where links are not supported.
+    """
+    dst = path + ".bak"
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(dst)
+    try:
+        # Link the real file: a hard link to a symlink would follow the rewrite
+        os.link(os.path.realpath(path), dst)
+    except OSError:
+        shutil.copy2(path, dst)
 
-    result = _BLOCK_COMMENT_RE.sub(convert_match, original)
+
+def _write_source(path, data, backup=False):
+    if backup:
+        _backup(path)
+    # Write a temp file next to the real target and rename it over it
+    target = os.path.realpath(path)
+    fd, tmp = tempfile.mkstemp(prefix=".cdoc-", suffix=".tmp", dir=os.path.dirname(target))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def convert_file(path, dry_run=False, backup=False):
+    original = _read_source(path)
+    if original is None:
+        return False
+    result = convert_bytes(original)
 
     if result == original:
         return False
 
-    if dry_run:
-        return True
+    if not dry_run:
+        _write_source(path, result, backup=backup)
+    return True
 
-    if backup:
-        shutil.copy2(path, path + ".bak")
 
+def _iter_files(target, exts):
+    """Yield source files under target whose name ends with one of exts."""
+    if os.path.isfile(target):
+        yield target
+        return
+    yield from _scan_dir(target, tuple(exts))
+
+
+def _scan_dir(path, exts):
+    # Like os.walk: skip unreadable directories, don't follow symlinked ones
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir():
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+        elif entry.name.lower().endswith(exts):
+            yield entry.path
+    for sub in subdirs:
+        yield from _scan_dir(sub, exts)
+
+
+def _convert_one(path, dry_run=False, backup=False):
+    return path, convert_file(path, dry_run=dry_run, backup=backup)
+
+
+# Files handed to a worker per round trip
+_CHUNKSIZE = 8
+
+
+def _convert_all(files, dry_run=False, backup=False, jobs=1):
+    """Yield (path, changed) for each file, in input order.
+
+    With jobs > 1 and enough files, conversion (CPU-bound regex work)
+    runs in a process pool. If the pool can't start or breaks, the
+    remaining files are converted in this process.
+    """
+    convert = functools.partial(_convert_one, dry_run=dry_run, backup=backup)
+    if jobs > 1:
+        files = list(files)
+    if jobs <= 1 or len(files) < _PARALLEL_MIN_FILES:
+        yield from map(convert, files)
+        return
+
+    done = 0
+    try:
+        with _process_pool(jobs) as pool:
+            for result in pool.map(convert, files, chunksize=_CHUNKSIZE):
+                yield result
+                done += 1
+    except _POOL_ERRORS:
+        yield from map(convert, files[done:])
+
+
+def _load_cache(path):
+    """Return the {path: [mtime_ns, size]} map stored at path, or {} if unusable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # Conversion rules change between releases, so a cache written by
+    # another version says nothing about what this one would do
+    if not isinstance(data, dict) or data.get("version") != __version__:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_cache(path, files):
+    # A torn write only costs a full rescan: _load_cache ignores bad JSON
     with open(path, "w", encoding="utf-8") as f:
-        f.write(result)
-    return True
+        json.dump({"version": __version__, "files": files}, f, sort_keys=True)
+
+
+def _skip_cached(files, cache, stats, hits):
+    """Yield the files whose mtime or size differ from their cache entry.
+
+    The stat of every file is recorded in stats; cache hits are appended
+    to hits instead of being yielded. Only files that needed no conversion
+    are ever cached, so a hit is known to be a no-op without reading it.
+    """
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            yield path
+            continue
+        key = [st.st_mtime_ns, st.st_size]
+        stats[path] = key
+        if cache.get(path) == key:
+            hits.append(path)
+        else:
+            yield path
 
 
 def main():
+    import argparse
+
     p = argparse.ArgumentParser(description="Convert gtk-doc markup to reST in C/C++ doc comments")
     p.add_argument("path", help="File or directory to convert")
     p.add_argument(
@@ -62,33 +249,56 @@ def main():
         "--dry-run", action="store_true", help="Show what would change without modifying files"
     )
     p.add_argument("--backup", action="store_true", help="Create .bak files before modifying")
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, no pool)",
+    )
+    p.add_argument(
+        "--cache",
+        metavar="FILE",
+        help="Remember files that needed no conversion in FILE and skip them on later runs",
+    )
     args = p.parse_args()
 
     target = args.path
-    exts = set(e if e.startswith(".") else f".{e}" for e in args.ext)
+    exts = {(e if e.startswith(".") else f".{e}").lower() for e in args.ext}
 
-    files = []
-    if os.path.isfile(target):
-        files.append(target)
-    elif os.path.isdir(target):
-        for dirpath, _, fnames in os.walk(target):
-            for fn in sorted(fnames):
-                _, ext = os.path.splitext(fn)
-                if ext.lower() in exts:
-                    files.append(os.path.join(dirpath, fn))
-    else:
+    if not os.path.exists(target):
         print(f"error: {target} not found", file=sys.stderr)
         sys.exit(1)
 
-    changed = 0
-    for fpath in files:
-        was_changed = convert_file(fpath, dry_run=args.dry_run, backup=args.backup)
+    files = _iter_files(target, exts)
+    cache = _load_cache(args.cache) if args.cache else None
+    stats = {}
+    hits = []
+    if cache is not None:
+        files = _skip_cached(files, cache, stats, hits)
+
+    fresh = {}
+    converted = []
+    total = 0
+    results = _convert_all(files, dry_run=args.dry_run, backup=args.backup, jobs=args.jobs)
+    for fpath, was_changed in results:
+        total += 1
         if was_changed:
-            changed += 1
-            tag = "[dry-run] " if args.dry_run else ""
-            print(f"{tag}converted: {fpath}")
+            converted.append(fpath)
+        elif fpath in stats:
+            fresh[fpath] = stats[fpath]
+
+    tag = "[dry-run] " if args.dry_run else ""
+    for fpath in sorted(converted):
+        print(f"{tag}converted: {fpath}")
+    changed = len(converted)
+
+    if cache is not None:
+        total += len(hits)
+        for fpath in hits:
+            fresh[fpath] = stats[fpath]
+        _save_cache(args.cache, fresh)
 
-    total = len(files)
     print(f"\n{changed}/{total} files {'would be ' if args.dry_run else ''}modified")
 
 
@@ -11,9 +11,14 @@ conversion, and gtk-doc markup translation.
 
 from __future__ import annotations
 
+import functools
+import mmap
+import multiprocessing
 import os
+import pickle
 import re
-import textwrap
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
@@ -64,6 +69,35 @@ class DocComment:
 _COMMENT_LINE_RE = re.compile(r"^\s*///\s?", re.MULTILINE)
 
 
+# Lines trimmed from either end of a block comment: blanks, stray comment
+# markers, and "=" rules (matched by _RULE_LINE_RE)
+_JUNK_LINES = frozenset({"", "*/", "**/", "/**", "*", "/", "="})
+_RULE_LINE_RE = re.compile(r"=+\Z")
+# Leading "*" (plus indentation and one optional space) of each comment line
+_STAR_PREFIX_RE = re.compile(r"^[^\S\n]*\* ?", re.MULTILINE)
+
+
+def _dedent_lines(lines):
+    """Remove the common leading whitespace of lines, like textwrap.dedent.
+
+    Works on an already-split list, so callers skip the join/re-split and
+    dedent's regex passes. Same rules: only spaces and tabs count as
+    indentation, lines holding nothing else become empty and do not take
+    part in the common margin.
+    """
+    margin = None
+    for line in lines:
+        content = line.lstrip(" \t")
+        if not content:
+            continue
+        indent = line[: len(line) - len(content)]
+        margin = indent if margin is None else os.path.commonprefix((margin, indent))
+        if not margin:
+            break
+    cut = len(margin) if margin else 0
+    return [line[cut:] if line.lstrip(" \t") else "" for line in lines]
+
+
 def _clean_block_comment(raw):
     text = raw
     if text.startswith("/**"):
@@ -73,38 +107,28 @@ def _clean_block_comment(raw):
     if text.endswith("*/"):
         text = text[:-2]
 
-    lines = text.split("\n")
     cleaned = []
-    for line in lines:
-        s = line.lstrip()
-        if s.startswith("* "):
-            cleaned.append(s[2:])
-        elif s.startswith("*"):
-            cleaned.append(s[1:])
-        else:
-            cleaned.append(line)
-
-    # Trim trailing junk: empty lines, stray comment closing markers
-    _JUNK = {"", "*/", "**/", "/**", "*", "/", "="}
-    while cleaned and (
-        cleaned[-1].strip() in _JUNK
-        or cleaned[-1].strip().startswith("==")
-        and set(cleaned[-1].strip()) <= {"="}
-    ):
-        cleaned.pop()
-    while cleaned and (
-        cleaned[0].strip() in _JUNK
-        or cleaned[0].strip().startswith("==")
-        and set(cleaned[0].strip()) <= {"="}
-    ):
-        cleaned.pop(0)
+    stripped = []
+    for line in _STAR_PREFIX_RE.sub("", text).split("\n"):
+        s = line.strip()
+        # Drop lines that are just leftover comment decorations
+        if s == "/**" or s == "**/":
+            continue
+        cleaned.append(line)
+        stripped.append(s)
 
-    # Drop interior lines that are just leftover comment decorations
-    cleaned = [ln for ln in cleaned if ln.strip() not in ("/**", "**/")]
+    # Trim leading and trailing junk: empty lines, stray closing markers
+    lo, hi = 0, len(cleaned)
+    while hi > lo and (stripped[hi - 1] in _JUNK_LINES or _RULE_LINE_RE.match(stripped[hi - 1])):
+        hi -= 1
+    while lo < hi and (stripped[lo] in _JUNK_LINES or _RULE_LINE_RE.match(stripped[lo])):
+        lo += 1
 
-    return textwrap.dedent("\n".join(cleaned)).strip()
+    return "\n".join(_dedent_lines(cleaned[lo:hi])).strip()
 
 
+# Memoized: shared headers repeat the same comments
+@functools.lru_cache(maxsize=4096)
 def clean_comment(raw):
     if raw.lstrip().startswith("///"):
         return _COMMENT_LINE_RE.sub("", raw).strip()
@@ -113,10 +137,13 @@ def clean_comment(raw):
 
 # ── gtk-doc → reST conversion ──
 
-_GTKDOC_FUNC_RE = re.compile(r"(?<![`\\#@%\w])(\w+)\(\)(?!`)")
-_GTKDOC_TYPE_RE = re.compile(r"(?<!\\)#(\w+)\.(\w+)|(?<!\\)#(\w+)")
-_GTKDOC_CONST_RE = re.compile(r"%(\w+)")
-_GTKDOC_PARAM_TEXT_RE = re.compile(r"@(\w+)")
+# Inline references: #Type / #Type.member, %CONST, func(), @param
+_GTKDOC_INLINE_RE = re.compile(
+    r"(?<!\\)#(?P<type>\w+)(?:\.(?P<member>\w+))?"
+    r"|%(?P<const>\w+)"
+    r"|(?<![`\\#@%\w])(?P<func>\w+)\(\)(?!`)"
+    r"|@(?P<param>\w+)"
+)
 _GTKDOC_PARAM_DOC_RE = re.compile(r"^@(\w+):\s*(.+)$", re.MULTILINE)
 _GTKDOC_RETURNS_RE = re.compile(r"^(?:Returns?|Return value):\s*(.+)$", re.MULTILINE)
 _GTKDOC_SINCE_RE = re.compile(r"^Since:\s*(.+)$", re.MULTILINE)
@@ -126,6 +153,15 @@ _GTKDOC_CODEBLOCK_RE = re.compile(
 )
 _GTKDOC_LITERAL_RE = re.compile(r"<literal>(.+?)</literal>")
 _GTKDOC_EMPHASIS_RE = re.compile(r"<emphasis>(.+?)</emphasis>")
+_GTKDOC_EXAMPLE_SECTION_RE = re.compile(
+    r"(^(?:Example(?:s| usage)?|HowTo|How\s*To|Notes?):?\s*$)"
+    r"(.*?)"
+    r"(?=^(?:@\w+\s*:|Returns?:|Since:|Deprecated:"
+    r"|Example(?:s| usage)?:|HowTo:|How\s*To:|Notes?:)|\Z)",
+    re.MULTILINE | re.DOTALL | re.IGNORECASE,
+)
+_GTKDOC_FENCE_RE = re.compile(r"```\w*\n.*?```", re.DOTALL)
+_GTKDOC_PROTECTED_RE = re.compile(r"\x00PROT\d+\x00")
 
 
 def gtkdoc_to_rst(text):
@@ -140,14 +176,6 @@ def gtkdoc_to_rst(text):
 
     # 1. Protect Example:, HowTo:, Notes/Note sections (including any |[...]| blocks)
     #    before any gtk-doc conversion runs
-    _example_section_re = re.compile(
-        r"(^(?:Example(?:s| usage)?|HowTo|How\s*To|Notes?):?\s*$)"
-        r"(.*?)"
-        r"(?=^(?:@\w+\s*:|Returns?:|Since:|Deprecated:"
-        r"|Example(?:s| usage)?:|HowTo:|How\s*To:|Notes?:)|\Z)",
-        re.MULTILINE | re.DOTALL | re.IGNORECASE,
-    )
-
     def _protect_example(m):
         header = m.group(1)
         body = m.group(2)
@@ -158,32 +186,29 @@ def gtkdoc_to_rst(text):
         counter[0] += 1
         return key
 
-    text = _example_section_re.sub(_protect_example, text)
+    text = _GTKDOC_EXAMPLE_SECTION_RE.sub(_protect_example, text)
 
     # 2. Convert remaining |[...]| blocks to fenced code blocks
     text = _GTKDOC_CODEBLOCK_RE.sub(_replace_codeblock, text)
 
     # 3. Protect remaining fenced code blocks
-    _fence_re = re.compile(r"```\w*\n.*?```", re.DOTALL)
-    text = _fence_re.sub(_protect, text)
+    text = _GTKDOC_FENCE_RE.sub(_protect, text)
 
     # 4. Run all gtk-doc conversions on unprotected text
     text = _GTKDOC_LITERAL_RE.sub(r"``\1``", text)
     text = _GTKDOC_EMPHASIS_RE.sub(r"*\1*", text)
 
+    # Line-anchored rewrites, applied in order
     text = _GTKDOC_PARAM_DOC_RE.sub(r":param \1: \2", text)
     text = _GTKDOC_RETURNS_RE.sub(r":returns: \1", text)
     text = _GTKDOC_SINCE_RE.sub(r"Since: \1", text)
     text = _GTKDOC_DEPRECATED_RE.sub(r"Deprecated: \1", text)
 
-    text = _GTKDOC_TYPE_RE.sub(_replace_type_ref, text)
-    text = _GTKDOC_CONST_RE.sub(r":const:`\1`", text)
-    text = _GTKDOC_FUNC_RE.sub(r":func:`\1`", text)
-    text = _GTKDOC_PARAM_TEXT_RE.sub(r"``\1``", text)
+    text = _GTKDOC_INLINE_RE.sub(_replace_inline_ref, text)
 
-    # 5. Restore all protected blocks
-    for key, val in protected.items():
-        text = text.replace(key, val)
+    # 5. Restore all protected blocks in one pass
+    if protected:
+        text = _GTKDOC_PROTECTED_RE.sub(lambda m: protected.get(m.group(0), m.group(0)), text)
 
     return text
 
@@ -194,36 +219,49 @@ def _replace_codeblock(m):
     return f"\n```{lang.lower()}\n{code}\n```\n"
 
 
-def _replace_type_ref(m):
-    if m.group(1) and m.group(2):
-        return f":member:`{m.group(1)}.{m.group(2)}`"
-    return f":type:`{m.group(3)}`"
+# Replacement per _GTKDOC_INLINE_RE alternative, keyed by m.lastgroup
+_GTKDOC_INLINE_TEMPLATES = {
+    "type": ":type:`{type}`",
+    "member": ":member:`{type}.{member}`",
+    "const": ":const:`{const}`",
+    "func": ":func:`{func}`",
+    "param": "``{param}``",
+}
+
+
+def _replace_inline_ref(m):
+    return _GTKDOC_INLINE_TEMPLATES[m.lastgroup].format_map(m.groupdict())
 
 
 # ── reST → Markdown conversion ──
 
-_RST_PARAM_RE = re.compile(r":param\s+(\w+):\s*(.+)")
-_RST_TYPE_RE = re.compile(r":type\s+(\w+):\s*(.+)")
-_RST_RETURN_RE = re.compile(r":returns?:\s*(.+)")
-_RST_RTYPE_RE = re.compile(r":rtype:\s*(.+)")
 _RST_REF_RE = re.compile(
     r":(?:c(?:pp)?:)?(?:func|macro|type|const|var|struct|union|enum|member|data|class):`([^`]+)`"
 )
 _RST_LITERAL_RE = re.compile(r"``([^`]+)``")
 _NAME_COLON_RE = re.compile(r"^\w[\w_]*\s*:\s*$")
 
+# reST field markers (prefix) and standalone section headers (whole line)
+_RST_LINE_RE = re.compile(
+    r"(?P<param>:param\s+(?P<param_name>\w+):\s*(?P<param_desc>.+))"
+    r"|(?P<type>:type\s+(?P<type_name>\w+):\s*(?P<type_desc>.+))"
+    r"|(?P<returns>:returns?:\s*(?P<returns_desc>.+))"
+    r"|(?P<rtype>:rtype:\s*.+)"
+    r"|(?P<codeblock>\.\. code-block::)"
+    r"|(?i:(?P<howto>(?:howto|how\s*to)\s*:\s*$))"
+    r"|(?i:(?P<notes>(?:notes?)\s*:\s*$))"
+    r"|(?i:(?P<example>(?:example|examples|example usage|usage example|sample|sample usage)"
+    r"s?\s*:?\s*$))"
+)
+_RST_FIELD_KINDS = frozenset({"param", "type", "returns", "rtype"})
 
-_EXAMPLE_HEADER_RE = re.compile(
-    r"^(?:example|examples|example usage|usage example|sample|sample usage)s?\s*:?\s*$",
+# Section header keyword at the end of a line of other text
+_INLINE_SECTION_RE = re.compile(
+    r"(?P<howto>(?:HowTo|HOWTO|How\s*To|how\s*to)\s*:\s*$)"
+    r"|(?P<notes>(?:Notes?|NOTES?)\s*:\s*$)"
+    r"|(?P<example>(?:Example|EXAMPLE|Examples|EXAMPLES|Sample|SAMPLE)s?\s*:\s*$)",
     re.IGNORECASE,
 )
-_EXAMPLE_INLINE_RE = re.compile(
-    r"(?:Example|EXAMPLE|Examples|EXAMPLES|Sample|SAMPLE)s?\s*:\s*$", re.IGNORECASE
-)
-_HOWTO_RE = re.compile(r"^(?:howto|how\s*to)\s*:\s*$", re.IGNORECASE)
-_HOWTO_INLINE_RE = re.compile(r"(?:HowTo|HOWTO|How\s*To|how\s*to)\s*:\s*$", re.IGNORECASE)
-_NOTES_RE = re.compile(r"^(?:notes?)\s*:\s*$", re.IGNORECASE)
-_NOTES_INLINE_RE = re.compile(r"(?:Notes?|NOTES?)\s*:\s*$", re.IGNORECASE)
 
 
 def _detect_code_lang(lines):
@@ -235,6 +273,21 @@ def _detect_code_lang(lines):
     return "c"
 
 
+# A codebase has only a handful of distinct return types
+@functools.lru_cache(maxsize=512)
+def _format_return_type(rt):
+    """Describe a signature return type for the Returns section, or None for void."""
+    if not rt or rt == "void":
+        return None
+    if "*" in rt:
+        # "char *" -> "Pointer to char"
+        base = rt.replace("*", "").strip()
+        stars = rt.count("*")
+        ptr = "Pointer to pointer to" if stars > 1 else "Pointer to"
+        return f"{ptr} `{base}`" if base else f"{ptr} void"
+    return f"`{rt}`"
+
+
 def rst_to_markdown(text, *, doc=None):
     result_lines = []
     params = {}  # name -> description
@@ -243,6 +296,10 @@ def rst_to_markdown(text, *, doc=None):
     # Collected examples: (label, code lines, paragraph position)
     example_blocks = []
     current_example = None  # (label, [lines]) or None
+    # Running state of current_example's lines: any non-blank line yet, and
+    # whether an odd number of ``` fence lines has been seen
+    example_has_code = False
+    example_in_fence = False
     example_counter = 0
     current_paragraph_start = 0
     # HowTo and Notes prose sections
@@ -266,6 +323,8 @@ def rst_to_markdown(text, *, doc=None):
 
     for line in text.split("\n"):
         stripped = line.strip()
+        km = _RST_LINE_RE.match(stripped)
+        kind = km.lastgroup if km else None
 
         # Strip "funcname:" header lines (redundant with heading)
         if not result_lines and current_section is None and _NAME_COLON_RE.match(stripped):
@@ -284,25 +343,27 @@ def rst_to_markdown(text, *, doc=None):
 
         # --- Detect section headers ---
 
+        # Inline headers end the (already stripped) line with a colon
+        inline = _INLINE_SECTION_RE.search(stripped) if stripped.endswith(":") else None
+        inline_kind = inline.lastgroup if inline else None
+
         # HowTo: (standalone or inline)
-        is_howto = _HOWTO_RE.match(stripped)
+        is_howto = kind == "howto"
         howto_inline = None
-        if not is_howto and current_section != "howto":
-            howto_inline = _HOWTO_INLINE_RE.search(stripped)
+        if not is_howto and current_section != "howto" and inline_kind == "howto":
+            howto_inline = inline
 
         # Notes: (standalone or inline)
-        is_notes = _NOTES_RE.match(stripped)
+        is_notes = kind == "notes"
         notes_inline = None
-        if not is_notes and current_section != "notes":
-            notes_inline = _NOTES_INLINE_RE.search(stripped)
+        if not is_notes and current_section != "notes" and inline_kind == "notes":
+            notes_inline = inline
 
         # Example: (standalone or inline)
-        is_standalone_example = _EXAMPLE_HEADER_RE.match(stripped)
-        if not is_standalone_example and stripped.startswith(".. code-block::"):
-            is_standalone_example = True
+        is_standalone_example = kind == "example" or kind == "codeblock"
         inline_match = None
-        if not is_standalone_example and current_section != "example":
-            inline_match = _EXAMPLE_INLINE_RE.search(stripped)
+        if not is_standalone_example and current_section != "example" and inline_kind == "example":
+            inline_match = inline
 
         # --- Handle section transitions ---
 
@@ -339,6 +400,7 @@ def rst_to_markdown(text, *, doc=None):
                     line_p = _RST_LITERAL_RE.sub(r"`\1`", line_p)
                     result_lines.append(line_p)
             current_example = (label, [])
+            example_has_code = example_in_fence = False
             current_section = "example"
             continue
 
@@ -346,12 +408,7 @@ def rst_to_markdown(text, *, doc=None):
 
         if current_section == "howto":
             # End howto on reST field markers
-            if (
-                _RST_PARAM_RE.match(stripped)
-                or _RST_RETURN_RE.match(stripped)
-                or _RST_TYPE_RE.match(stripped)
-                or _RST_RTYPE_RE.match(stripped)
-            ):
+            if kind in _RST_FIELD_KINDS:
                 _finalize_section()
                 # Fall through
             else:
@@ -359,35 +416,19 @@ def rst_to_markdown(text, *, doc=None):
                 continue
 
         if current_section == "notes":
-            if (
-                _RST_PARAM_RE.match(stripped)
-                or _RST_RETURN_RE.match(stripped)
-                or _RST_TYPE_RE.match(stripped)
-                or _RST_RTYPE_RE.match(stripped)
-            ):
+            if kind in _RST_FIELD_KINDS:
                 _finalize_section()
             else:
                 notes_lines.append(line)
                 continue
 
         if current_section == "example":
-            if (
-                _RST_PARAM_RE.match(stripped)
-                or _RST_RETURN_RE.match(stripped)
-                or _RST_TYPE_RE.match(stripped)
-                or _RST_RTYPE_RE.match(stripped)
-            ):
+            if kind in _RST_FIELD_KINDS:
                 _finalize_section()
             else:
-                ex_lines = current_example[1]
-                has_code = any(ln.strip() for ln in ex_lines)
-                in_fence = (
-                    any(ln.strip().startswith("```") for ln in ex_lines)
-                    and sum(1 for ln in ex_lines if ln.strip().startswith("```")) % 2 == 1
-                )
                 if (
-                    has_code
-                    and not in_fence
+                    example_has_code
+                    and not example_in_fence
                     and stripped
                     and not line.startswith((" ", "\t"))
                     and not stripped.startswith("```")
@@ -395,15 +436,14 @@ def rst_to_markdown(text, *, doc=None):
                     _finalize_section()
                     current_paragraph_start = len(result_lines)
                     # Re-check for HowTo/Notes/Example on this line
-                    re_howto = _HOWTO_RE.match(stripped) or _HOWTO_INLINE_RE.search(stripped)
-                    re_notes = _NOTES_RE.match(stripped) or _NOTES_INLINE_RE.search(stripped)
-                    re_ex_s = _EXAMPLE_HEADER_RE.match(stripped)
-                    re_ex_i = _EXAMPLE_INLINE_RE.search(stripped)
+                    re_howto = is_howto or inline_kind == "howto"
+                    re_notes = is_notes or inline_kind == "notes"
+                    re_ex_s = kind == "example"
+                    re_ex_i = inline if inline_kind == "example" else None
                     if re_howto:
                         current_section = "howto"
-                        if not _HOWTO_RE.match(stripped):
-                            m = _HOWTO_INLINE_RE.search(stripped)
-                            before = stripped[: m.start()].rstrip()
+                        if not is_howto:
+                            before = stripped[: inline.start()].rstrip()
                             if before:
                                 result_lines.append(
                                     _RST_LITERAL_RE.sub(r"`\1`", _RST_REF_RE.sub(r"`\1`", before))
@@ -411,9 +451,8 @@ def rst_to_markdown(text, *, doc=None):
                         continue
                     elif re_notes:
                         current_section = "notes"
-                        if not _NOTES_RE.match(stripped):
-                            m = _NOTES_INLINE_RE.search(stripped)
-                            before = stripped[: m.start()].rstrip()
+                        if not is_notes:
+                            before = stripped[: inline.start()].rstrip()
                             if before:
                                 result_lines.append(
                                     _RST_LITERAL_RE.sub(r"`\1`", _RST_REF_RE.sub(r"`\1`", before))
@@ -430,27 +469,29 @@ def rst_to_markdown(text, *, doc=None):
                                     _RST_LITERAL_RE.sub(r"`\1`", _RST_REF_RE.sub(r"`\1`", before))
                                 )
                         current_example = (label, [])
+                        example_has_code = example_in_fence = False
                         current_section = "example"
                         continue
                     # Fall through to normal processing
                 else:
-                    ex_lines.append(line)
+                    current_example[1].append(line)
+                    if stripped:
+                        example_has_code = True
+                        if stripped.startswith("```"):
+                            example_in_fence = not example_in_fence
                     continue
 
         # --- Normal line processing ---
-        m = _RST_PARAM_RE.match(stripped)
-        if m:
-            params[m.group(1)] = m.group(2)
+        if kind == "param":
+            params[km.group("param_name")] = km.group("param_desc")
             continue
-        m = _RST_TYPE_RE.match(stripped)
-        if m:
-            param_types[m.group(1)] = m.group(2)
+        if kind == "type":
+            param_types[km.group("type_name")] = km.group("type_desc")
             continue
-        m = _RST_RETURN_RE.match(stripped)
-        if m:
-            returns = m.group(1)
+        if kind == "returns":
+            returns = km.group("returns_desc")
             continue
-        if _RST_RTYPE_RE.match(stripped):
+        if kind == "rtype":
             continue
 
         line = _RST_REF_RE.sub(r"`\1`", line)
@@ -461,8 +502,10 @@ def rst_to_markdown(text, *, doc=None):
     _finalize_section()
 
     # Strip trailing empty lines from body
-    while result_lines and not result_lines[-1].strip():
-        result_lines.pop()
+    end = len(result_lines)
+    while end and not result_lines[end - 1].strip():
+        end -= 1
+    del result_lines[end:]
 
     # Build return info from signature if not in doc comment
     # Skip for macros (#define) — they don't have a meaningful return type
@@ -472,17 +515,7 @@ def rst_to_markdown(text, *, doc=None):
         and doc.return_type
         and doc.kind not in (SymbolKind.MACRO, SymbolKind.MACRO_FUNCTION)
     ):
-        rt = doc.return_type.strip()
-        rt = doc.return_type.strip()
-        if rt and rt != "void":
-            if "*" in rt:
-                # "char *" -> "Pointer to char"
-                base = rt.replace("*", "").strip()
-                stars = rt.count("*")
-                ptr = "Pointer to pointer to" if stars > 1 else "Pointer to"
-                returns = f"{ptr} `{base}`" if base else f"{ptr} void"
-            else:
-                returns = f"`{rt}`"
+        returns = _format_return_type(doc.return_type.strip())
 
     # Build parameter table with Type column
     if params:
@@ -512,28 +545,28 @@ def rst_to_markdown(text, *, doc=None):
     # Process in reverse order so insertions don't shift later indices
     for label, ex_lines, para_idx in reversed(example_blocks):
         # Strip leading/trailing blank lines
-        while ex_lines and not ex_lines[0].strip():
-            ex_lines.pop(0)
-        while ex_lines and not ex_lines[-1].strip():
-            ex_lines.pop()
-        if not ex_lines:
+        lo, hi = 0, len(ex_lines)
+        while lo < hi and not ex_lines[lo].strip():
+            lo += 1
+        while hi > lo and not ex_lines[hi - 1].strip():
+            hi -= 1
+        if lo == hi:
             continue
+        ex_lines = ex_lines[lo:hi]
         has_fence = any(ln.strip().startswith("```") for ln in ex_lines)
         marker_lines = [f"<!-- EXAMPLE_START:{label} -->"]
         if has_fence:
             marker_lines.extend(ex_lines)
         else:
-            joined = "\n".join(ex_lines)
             lang = _detect_code_lang(ex_lines)
             marker_lines.append(f"```{lang}")
-            marker_lines.extend(textwrap.dedent(joined).split("\n"))
+            marker_lines.extend(_dedent_lines(ex_lines))
             marker_lines.append("```")
         marker_lines.append("<!-- EXAMPLE_END -->")
 
         # Insert at the paragraph start so the card floats beside the paragraph
         insert_at = min(para_idx, len(result_lines))
-        for j, ml in enumerate(marker_lines):
-            result_lines.insert(insert_at + j, ml)
+        result_lines[insert_at:insert_at] = marker_lines
 
     # Emit HowTo and Notes as markers for the renderer
     _howto_text = "\n".join(howto_lines).strip()
@@ -569,41 +602,55 @@ if CLANG_AVAILABLE:
     }
 
 
-def _get_signature(cursor):
-    kind = _KIND_MAP.get(cursor.kind, SymbolKind.GENERIC)
-    name = cursor.spelling or cursor.displayname
-    if kind == SymbolKind.FUNCTION:
-        rtype = cursor.result_type.spelling if cursor.result_type else "void"
-        params = []
-        for ch in cursor.get_children():
-            if ch.kind == CursorKind.PARM_DECL:
-                params.append(f"{ch.type.spelling} {ch.spelling}".strip())
-        return f"{rtype} {name}({', '.join(params)})"
-    elif kind == SymbolKind.VARIABLE:
-        return f"{cursor.type.spelling} {name}"
-    elif kind == SymbolKind.TYPEDEF:
-        return f"typedef {cursor.underlying_typedef_type.spelling} {name}"
-    elif kind in (SymbolKind.STRUCT, SymbolKind.UNION, SymbolKind.CLASS):
-        kw = {SymbolKind.STRUCT: "struct", SymbolKind.UNION: "union", SymbolKind.CLASS: "class"}[
-            kind
-        ]
-        return f"{kw} {name}"
-    elif kind == SymbolKind.ENUM:
-        return f"enum {name}"
-    elif kind == SymbolKind.FIELD:
-        return f"{cursor.type.spelling} {name}"
-    return name
-
-
-def _get_params(cursor):
-    if not CLANG_AVAILABLE:
-        return []
-    return [
+def _sig_function(cursor, name, params):
+    rtype = cursor.result_type.spelling if cursor.result_type else "void"
+    args = ", ".join(f"{ptype} {pname}".strip() for ptype, pname in params)
+    return f"{rtype} {name}({args})"
+
+
+def _sig_typed(cursor, name, params):
+    return f"{cursor.type.spelling} {name}"
+
+
+def _sig_typedef(cursor, name, params):
+    return f"typedef {cursor.underlying_typedef_type.spelling} {name}"
+
+
+def _sig_keyword(keyword):
+    return lambda cursor, name, params: f"{keyword} {name}"
+
+
+# Signature formatter per symbol kind; anything else is shown by name
+_SIG_BUILDERS = {
+    SymbolKind.FUNCTION: _sig_function,
+    SymbolKind.VARIABLE: _sig_typed,
+    SymbolKind.FIELD: _sig_typed,
+    SymbolKind.TYPEDEF: _sig_typedef,
+    SymbolKind.STRUCT: _sig_keyword("struct"),
+    SymbolKind.UNION: _sig_keyword("union"),
+    SymbolKind.CLASS: _sig_keyword("class"),
+    SymbolKind.ENUM: _sig_keyword("enum"),
+}
+
+
+def _signature_and_params(cursor):
+    """Return (signature, [(type, name), ...]) for cursor.
+
+    Walks the children once: each child cursor is a libclang round trip,
+    and the parameter list feeds both the signature and the params field.
+    Non-function kinds can still carry parameters (function pointers).
+    """
+    parm_decl = CursorKind.PARM_DECL
+    params = [
         (ch.type.spelling, ch.spelling or "")
         for ch in cursor.get_children()
-        if ch.kind == CursorKind.PARM_DECL
+        if ch.kind == parm_decl
     ]
 
+    name = cursor.spelling or cursor.displayname
+    build = _SIG_BUILDERS.get(_KIND_MAP.get(cursor.kind))
+    return (build(cursor, name, params) if build else name), params
+
 
 def _parse_cursor(cursor, filename):
     raw = cursor.raw_comment
@@ -618,11 +665,12 @@ def _parse_cursor(cursor, filename):
         if len(tokens) >= 2 and tokens[1].spelling == "(":
             kind = SymbolKind.MACRO_FUNCTION
 
+    signature, params = _signature_and_params(cursor)
     doc = DocComment(
         name=name,
         kind=kind,
         comment=clean_comment(raw),
-        signature=_get_signature(cursor),
+        signature=signature,
         filename=filename,
         line=cursor.location.line if cursor.location else 0,
         return_type=(
@@ -630,7 +678,7 @@ def _parse_cursor(cursor, filename):
             if hasattr(cursor, "result_type") and cursor.result_type
             else ""
         ),
-        params=_get_params(cursor),
+        params=params,
     )
 
     if kind in (SymbolKind.STRUCT, SymbolKind.UNION, SymbolKind.CLASS, SymbolKind.ENUM):
@@ -641,13 +689,40 @@ def _parse_cursor(cursor, filename):
     return doc
 
 
+# Comment openers libclang attaches as raw_comment (Doxygen/JavaDoc styles)
+_DOC_MARKERS = (b"/**", b"/*!", b"///", b"//!")
+
+
+def _has_doc_markers(filepath):
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    except OSError:
+        return True  # let the parser report it
+    return any(marker in data for marker in _DOC_MARKERS)
+
+
+# One libclang Index per thread, reused across parse_file calls
+_index_local = threading.local()
+
+
+def _get_index():
+    idx = getattr(_index_local, "index", None)
+    if idx is None:
+        idx = _index_local.index = Index.create()
+    return idx
+
+
 def parse_file(filepath, clang_args=None):
     if not CLANG_AVAILABLE:
         raise RuntimeError("clang bindings not available, pip install clang")
 
-    idx = Index.create()
     args = list(clang_args or []) + ["-detailed-preprocessing-record"]
+    # No doc comment, nothing to extract (unless every comment counts)
+    if "-fparse-all-comments" not in args and not _has_doc_markers(filepath):
+        return []
 
+    idx = _get_index()
     try:
         tu = idx.parse(
             filepath, args=args, options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
@@ -670,19 +745,44 @@ def parse_file(filepath, clang_args=None):
 
 # -- regex fallback --
 
+# Match /** comment */ followed by a C declaration
+_DOC_DECL_RE = re.compile(r"/\*\*(.+?)\*/\s*\n\s*(.+?)(?:\n|;|\{)", re.DOTALL)
+_PARAM_LIST_RE = re.compile(r"\(([^)]*)\)")
+# Same match over raw bytes; \r\n and lone \r count as line breaks
+_DOC_DECL_BYTES_RE = re.compile(rb"/\*\*(.+?)\*/\s*[\r\n]\s*(.+?)(?:[\r\n]|;|\{)", re.DOTALL)
+_NEWLINE_RE = re.compile(r"\r\n?")
+
+# Files at least this large are scanned through a read-only mapping
+_MMAP_MIN_SIZE = 1 << 20
+
+
+def _iter_doc_decls(filepath):
+    """Yield the (comment body, declaration) text of each documented declaration."""
+    if os.path.getsize(filepath) >= _MMAP_MIN_SIZE:
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"/**") == -1:
+                return
+            for m in _DOC_DECL_BYTES_RE.finditer(mm):
+                body = m.group(1).decode("utf-8", errors="replace")
+                decl = m.group(2).decode("utf-8", errors="replace")
+                yield _NEWLINE_RE.sub("\n", body), _NEWLINE_RE.sub("\n", decl)
+        return
 
-def parse_file_regex(filepath):
     with open(filepath, "r", encoding="utf-8", errors="replace") as f:
         source = f.read()
+    if "/**" not in source:
+        return
+    for m in _DOC_DECL_RE.finditer(source):
+        yield m.group(1), m.group(2)
 
+
+def parse_file_regex(filepath):
     docs = []
     fname = os.path.basename(filepath)
-    # Match /** comment */ followed by a C declaration
-    pat = re.compile(r"/\*\*(.+?)\*/\s*\n\s*(.+?)(?:\n|;|\{)", re.DOTALL)
 
-    for m in pat.finditer(source):
-        comment = clean_comment("/**" + m.group(1) + "*/")
-        decl = m.group(2).strip()
+    for body, decl in _iter_doc_decls(filepath):
+        comment = clean_comment("/**" + body + "*/")
+        decl = decl.strip()
 
         # Skip if "declaration" is actually another comment or empty
         if not decl or decl.startswith("/*") or decl.startswith("//"):
@@ -711,7 +811,7 @@ def parse_file_regex(filepath):
                     return_type = " ".join(rtype_parts) if rtype_parts else ""
                 return_type = return_type.strip()
             # Extract params from parenthesized portion
-            paren_match = re.search(r"\(([^)]*)\)", decl)
+            paren_match = _PARAM_LIST_RE.search(decl)
             if paren_match:
                 param_str = paren_match.group(1).strip()
                 if param_str and param_str != "void":
@@ -762,6 +862,71 @@ def parse_file_regex(filepath):
     return docs
 
 
+# -- batch parsing --
+
+# Below this many files a pool costs more to start than it saves
+_PARALLEL_MIN_FILES = 16
+
+
+# Raised when a worker pool can't start (no sem_open or /dev/shm, as in some
+# sandboxed CI runners) or dies under us; callers then parse serially
+_POOL_ERRORS = (OSError, ImportError, NotImplementedError, BrokenExecutor)
+
+
+def _process_pool(workers):
+    # Never fork: the host (e.g. mkdocs serve with its livereload thread)
+    # may be multi-threaded, and forking a threaded process can deadlock
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def _parse_one(filepath, clang_args=None, use_clang=False):
+    try:
+        if use_clang:
+            return parse_file(filepath, clang_args=clang_args), None
+        return parse_file_regex(filepath), None
+    except Exception as exc:
+        return [], exc
+
+
+def parse_files(filepaths, clang_args=None, use_clang=None, workers=None):
+    """Parse several files, yielding ``(filepath, docs, error)`` in input order.
+
+    Files are independent, so they are spread over a pool: threads for
+    libclang, which releases the GIL while parsing, and processes for the
+    pure-Python regex backend. ``error`` is the exception a file raised
+    (with ``docs`` empty), or None. If the pool can't start or breaks, the
+    remaining files are parsed in this process instead.
+    """
+    if use_clang is None:
+        use_clang = CLANG_AVAILABLE
+    filepaths = list(filepaths)
+    workers = workers or os.cpu_count() or 1
+    parse = functools.partial(_parse_one, clang_args=clang_args, use_clang=use_clang)
+
+    if workers <= 1 or len(filepaths) < _PARALLEL_MIN_FILES:
+        for path in filepaths:
+            yield (path, *parse(path))
+        return
+
+    done = 0
+    try:
+        if use_clang:
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            pool = _process_pool(workers)
+        with pool:
+            for path, result in zip(filepaths, pool.map(parse, filepaths, chunksize=4)):
+                yield (path, *result)
+                done += 1
+    except _POOL_ERRORS:
+        # Per-file errors are returned by _parse_one, so this is the pool
+        # itself failing; finish the remaining files in this process
+        for path in filepaths[done:]:
+            yield (path, *parse(path))
+
+
 # -- IGT test metadata parsing --
 
 
@@ -787,28 +952,41 @@ _IGT_SUBTEST_CALL_RE = re.compile(
     re.MULTILINE,
 )
 _IGT_DESCRIBE_RE = re.compile(r'igt_describe\s*\(\s*"([^"]+)"\s*\)')
+# igt_describe( whose string runs on past the end of the line
+_IGT_DESCRIBE_START_RE = re.compile(r'igt_describe\s*\(\s*"([^"]*)"?\s*$')
+# TEST: marker of the main test block, as opposed to a SUBTEST: entry
+_IGT_MAIN_TEST_RE = re.compile(r"(?<!\bSUB)TEST:")
+_QUOTED_STRING_RE = re.compile(r'"([^"]*)"')
+# igt_subtest("name"), igt_subtest_f("name"...) and igt_subtest_with_dynamic("name")
+# followed by the opening brace of the body
+_IGT_SUBTEST_BODY_RE = re.compile(
+    r'igt_subtest(?:_f|_with_dynamic(?:_f)?)?\s*\(\s*"([^"]+)"[^)]*\)\s*\{',
+)
 _IGT_DYNAMIC_RE = re.compile(
     r'igt_subtest_with_dynamic\s*\(\s*"([^"]+)"\s*\)|'
     r'igt_subtest_with_dynamic_f\s*\(\s*"([^"]+)"',
 )
 
 
+# Like _STAR_PREFIX_RE, but indentation is dropped even without a "*"
+_STAR_INDENT_RE = re.compile(r"^[^\S\n]*(?:\* ?)?", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_structured_comment(text):
-    lines = text.split("\n")
-    cleaned = []
-    for line in lines:
-        s = line.lstrip()
-        if s.startswith("* "):
-            cleaned.append(s[2:])
-        elif s.startswith("*"):
-            cleaned.append(s[1:])
-        else:
-            cleaned.append(s)
-    return "\n".join(cleaned).strip()
+    return _STAR_INDENT_RE.sub("", text).strip()
+
+
+# "Key: value" line of a test comment, split on the first colon
+_TEST_FIELD_LINE_RE = re.compile(r"([\w\s-]+):(.*)")
 
 
 def _parse_test_comment(comment_text):
-    text = _parse_structured_comment(comment_text)
+    return _parse_test_text(_parse_structured_comment(comment_text))
+
+
+def _parse_test_text(text):
+    """Parse the already de-starred text of a TEST: comment block."""
     if "TEST:" not in text:
         return None
 
@@ -819,11 +997,13 @@ def _parse_test_comment(comment_text):
 
     for line in text.split("\n"):
         stripped = line.strip()
+        m = _TEST_FIELD_LINE_RE.match(stripped)
+        key_raw = m.group(1) if m else None
 
-        if stripped.startswith("SUBTEST:"):
+        if key_raw == "SUBTEST":
             _flush_multiline(current_target, current_key)
             current_key = None
-            name = stripped[len("SUBTEST:") :].strip()
+            name = m.group(2).strip()
             # Skip format-string subtests
             if "%s" in name or "%d" in name or "%u" in name:
                 current_subtest = None
@@ -834,25 +1014,22 @@ def _parse_test_comment(comment_text):
             test.subtests.append(current_subtest)
             continue
 
-        if stripped.startswith("TEST:"):
+        if key_raw == "TEST":
             _flush_multiline(current_target, current_key)
             current_key = None
-            test.name = stripped[len("TEST:") :].strip()
+            test.name = m.group(2).strip()
             current_subtest = None
             current_target = test.fields
             continue
 
-        if ":" in stripped:
-            key, _, val = stripped.partition(":")
-            key_raw = key.strip()
+        if m:
+            key_raw = key_raw.strip()
             key_clean = key_raw.lower().replace(" ", "_")
-            val = val.strip()
+            val = m.group(2).strip()
             # Only treat as a field if key looks like a field name:
             # - up to 3 words (e.g. "Mega feature", "Sub category")
-            # - no punctuation other than hyphens/underscores
-            word_count = len(key_raw.split())
-            looks_like_field = key_clean and word_count <= 3 and re.match(r"^[\w\s-]+$", key_raw)
-            if looks_like_field:
+            # - no punctuation other than hyphens/underscores (the regex)
+            if len(key_raw.split()) <= 3:
                 _flush_multiline(current_target, current_key)
                 target = current_subtest.fields if current_subtest else test.fields
                 current_target = target
@@ -860,18 +1037,14 @@ def _parse_test_comment(comment_text):
                     target[key_clean] = val
                     current_key = None
                 else:
-                    # Value on next line(s)
-                    target[key_clean] = ""
+                    # Value on next line(s), joined when the field is flushed
+                    target[key_clean] = []
                     current_key = key_clean
                 continue
 
         # Continuation line for multi-line value
         if stripped and current_key and current_target is not None:
-            existing = current_target.get(current_key, "")
-            if existing:
-                current_target[current_key] = existing + " " + stripped
-            else:
-                current_target[current_key] = stripped
+            current_target[current_key].append(stripped)
             continue
 
         # Blank line — stop accumulating
@@ -885,23 +1058,81 @@ def _parse_test_comment(comment_text):
 
 
 def _flush_multiline(target, key):
-    """Clean up a multi-line field value."""
+    """Clean up a multi-line field value.
+
+    Values continued over several lines are collected as a list of lines
+    and joined here once, rather than re-concatenated on every line.
+    """
     if target and key and key in target:
-        target[key] = target[key].strip()
+        value = target[key]
+        target[key] = " ".join(value) if isinstance(value, list) else value.strip()
+
+
+def _parse_standalone_subtests(block_text, subtests):
+    """Collect the SUBTEST: entries of a comment block into subtests (name -> fields)."""
+    current_name = None
+    current_key = None
+    current_fields = None
+    for bline in block_text.split("\n"):
+        stripped = bline.strip()
+        if stripped.startswith("SUBTEST:"):
+            if current_name and current_fields:
+                _flush_multiline(current_fields, current_key)
+                subtests[current_name] = current_fields
+            current_name = stripped[len("SUBTEST:") :].strip()
+            if "%s" in current_name or "%d" in current_name or "%u" in current_name:
+                current_name = None
+                current_fields = None
+                current_key = None
+                continue
+            current_fields = {}
+            current_key = None
+            continue
+        if current_fields is None:
+            continue
+        m = _TEST_FIELD_LINE_RE.match(stripped)
+        if m:
+            key_raw = m.group(1).strip()
+            key_clean = key_raw.lower().replace(" ", "_")
+            # Same field-name rule as _parse_test_text: up to 3 words
+            if len(key_raw.split()) <= 3:
+                _flush_multiline(current_fields, current_key)
+                val = m.group(2).strip()
+                if val:
+                    current_fields[key_clean] = val
+                    current_key = None
+                else:
+                    current_fields[key_clean] = []
+                    current_key = key_clean
+                continue
+        # Continuation line
+        if stripped and current_key and current_fields is not None:
+            current_fields[current_key].append(stripped)
+            continue
+        if not stripped and current_key:
+            _flush_multiline(current_fields, current_key)
+            current_key = None
+    if current_name and current_fields:
+        _flush_multiline(current_fields, current_key)
+        subtests[current_name] = current_fields
 
 
 def _extract_brace_body(source, open_pos):
     """Extract the content between { and matching } starting at open_pos."""
+    # Jump from brace to brace, tracking the next "{" and "}" positions
     depth = 0
-    i = open_pos
-    while i < len(source):
-        if source[i] == "{":
+    find = source.find
+    nxt_open = find("{", open_pos)
+    nxt_close = find("}", open_pos)
+    while nxt_close != -1:
+        if nxt_open != -1 and nxt_open < nxt_close:
             depth += 1
-        elif source[i] == "}":
+            nxt_open = find("{", nxt_open + 1)
+        else:
             depth -= 1
             if depth == 0:
-                return source[open_pos + 1 : i]
-        i += 1
+                return source[open_pos + 1 : nxt_close]
+            nxt_close = find("}", nxt_close + 1)
     return ""
 
 
@@ -916,17 +1147,24 @@ _STEP_FUNC_CALL_RE = re.compile(r"(\w+)\s*\(")
 _STEP_ASSIGN_RE = re.compile(r"(\w[\w\.\->]*)\s*=\s*(.+)")
 
 # Ignored patterns — boilerplate that should not become steps
-_STEP_IGNORE = {
-    "close",
-    "free",
-    "munmap",
-    "memset",
-    "memcpy",
-    "errno",
-    "return",
-    "break",
-    "continue",
-}
+_STEP_IGNORE = frozenset(
+    {
+        "close",
+        "free",
+        "munmap",
+        "memset",
+        "memcpy",
+        "errno",
+        "return",
+        "break",
+        "continue",
+    }
+)
+
+# Prefixes of steps generated from code; anything else came from a comment
+_STEP_CODE_PREFIXES = ("Assert ", "Call ", "Require ", "Set ", "Skip ")
+# Code steps that a directly preceding comment step already describes
+_STEP_DEDUP_PREFIXES = ("Assert ", "Call ", "Set ")
 
 
 def _parse_subtest_steps(body):
@@ -936,7 +1174,8 @@ def _parse_subtest_steps(body):
       - a string  (normal numbered step)
       - a tuple   ("if", condition_text, [child_step_strings])
     """
-    raw = _collect_raw_steps(body.split("\n"), 0, len(body.split("\n")))
+    lines = body.split("\n")
+    raw = _collect_raw_steps(lines, 0, len(lines))
 
     # Post-process: deduplicate comment + code step pairs
     deduped = []
@@ -944,16 +1183,10 @@ def _parse_subtest_steps(body):
     while i < len(raw):
         item = raw[i]
         if isinstance(item, str):
-            is_comment = (
-                not item.startswith("Assert ")
-                and not item.startswith("Call ")
-                and not item.startswith("Require ")
-                and not item.startswith("Set ")
-                and not item.startswith("Skip ")
-            )
+            is_comment = not item.startswith(_STEP_CODE_PREFIXES)
             if is_comment and i + 1 < len(raw) and isinstance(raw[i + 1], str):
                 nxt = raw[i + 1]
-                if nxt.startswith("Assert ") or nxt.startswith("Call ") or nxt.startswith("Set "):
+                if nxt.startswith(_STEP_DEDUP_PREFIXES):
                     deduped.append(item)
                     i += 2
                     continue
@@ -963,9 +1196,11 @@ def _parse_subtest_steps(body):
     return deduped
 
 
-# Regex to match if/else if lines and capture the condition
-_IF_RE = re.compile(r"^(?:}\s*)?(?:else\s+)?if\s*\((.+?)\)\s*\{?\s*$")
-_ELSE_RE = re.compile(r"^}\s*else\s*\{?\s*$")
+# Match an if / else if line, capturing the condition as "cond", or a
+# "} else {" line ("else"); a line is at most one of the two
+_CONTROL_RE = re.compile(
+    r"(?:}\s*)?(?:else\s+)?if\s*\((?P<cond>.+?)\)\s*\{?\s*$|(?P<else>}\s*else\s*\{?\s*$)"
+)
 
 
 def _collect_raw_steps(lines, start, end):
@@ -980,9 +1215,9 @@ def _collect_raw_steps(lines, start, end):
             continue
 
         # Detect if (...) { block
-        m_if = _IF_RE.match(line)
-        if m_if:
-            condition = m_if.group(1).strip()
+        m_ctrl = _CONTROL_RE.match(line) if "if" in line or "else" in line else None
+        if m_ctrl and m_ctrl.lastgroup == "cond":
+            condition = m_ctrl.group("cond").strip()
             # Find the matching closing brace
             block_end = _find_block_end(lines, i, end)
             # Recursively collect steps inside the if-body
@@ -994,17 +1229,16 @@ def _collect_raw_steps(lines, start, end):
             # Check for } else { or } else if on the closing brace line
             closing_line = lines[block_end].strip() if block_end < end else ""
             while True:
-                m_eic = _ELSE_IF_COMBINED_RE.match(closing_line)
-                m_ec = _ELSE_COMBINED_RE.match(closing_line)
-                if m_eic:
-                    cond2 = m_eic.group(1).strip()
+                m_close = _ELSE_CLOSE_RE.match(closing_line)
+                if m_close and m_close.group("cond") is not None:
+                    cond2 = m_close.group("cond").strip()
                     block_end2 = _find_block_end(lines, i, end)
                     child2 = _collect_raw_steps(lines, i, block_end2)
                     if child2:
                         steps.append(("if", cond2, child2))
                     closing_line = lines[block_end2].strip() if block_end2 < end else ""
                     i = block_end2 + 1
-                elif m_ec:
+                elif m_close:
                     block_end2 = _find_block_end(lines, i, end)
                     child2 = _collect_raw_steps(lines, i, block_end2)
                     if child2:
@@ -1018,16 +1252,16 @@ def _collect_raw_steps(lines, start, end):
                         next_i += 1
                     if next_i < end:
                         nl = lines[next_i].strip()
-                        m_eic2 = _IF_RE.match(nl)
-                        m_ec2 = _ELSE_RE.match(nl)
-                        if m_eic2 and "else" in nl:
+                        m_ctrl2 = _CONTROL_RE.match(nl)
+                        if m_ctrl2 and m_ctrl2.lastgroup == "cond" and "else" in nl:
                             i = next_i
                             # Let the loop re-check
                             closing_line = nl
                             # Rewrite as combined form to reuse logic
-                            if _ELSE_IF_COMBINED_RE.match(closing_line):
+                            m_close = _ELSE_CLOSE_RE.match(closing_line)
+                            if m_close and m_close.group("cond") is not None:
                                 continue
-                        elif m_ec2:
+                        elif m_ctrl2 and m_ctrl2.lastgroup == "else":
                             i = next_i + 1
                             block_end2 = _find_block_end(lines, i, end)
                             child2 = _collect_raw_steps(lines, i, block_end2)
@@ -1038,8 +1272,7 @@ def _collect_raw_steps(lines, start, end):
             continue
 
         # Detect else-if or else at top level (without leading })
-        m_else = _ELSE_RE.match(line)
-        if m_else:
+        if m_ctrl:
             block_end = _find_block_end(lines, i, end)
             child_steps = _collect_raw_steps(lines, i, block_end)
             if child_steps:
@@ -1048,72 +1281,82 @@ def _collect_raw_steps(lines, start, end):
             continue
 
         # --- Regular step extraction (same as before) ---
+        # Each pattern below needs a literal marker; check for it first
 
         # Block comments: /* ... */
-        mc = _STEP_COMMENT_RE.search(line)
-        if mc and not line.startswith("/*<") and "language=" not in line:
-            comment_text = mc.group(1).strip()
-            comment_text = re.sub(r"\s*\n\s*\*?\s*", " ", comment_text)
-            if comment_text and len(comment_text) > 2:
-                steps.append(comment_text.rstrip(".") + ".")
-            continue
+        if "/*" in line:
+            mc = _STEP_COMMENT_RE.search(line)
+            if mc and not line.startswith("/*<") and "language=" not in line:
+                comment_text = mc.group(1).strip()
+                # Lines split from a body hold no newline; skip the regex then
+                if "\n" in comment_text:
+                    comment_text = re.sub(r"\s*\n\s*\*?\s*", " ", comment_text)
+                if comment_text and len(comment_text) > 2:
+                    steps.append(comment_text.rstrip(".") + ".")
+                continue
 
         # Line comments: // ...
-        mlc = _STEP_LINE_COMMENT_RE.match(line)
-        if mlc:
-            comment_text = mlc.group(1).strip()
-            if comment_text and len(comment_text) > 2:
-                steps.append(comment_text.rstrip(".") + ".")
-            continue
+        if line.startswith("//"):
+            mlc = _STEP_LINE_COMMENT_RE.match(line)
+            if mlc:
+                comment_text = mlc.group(1).strip()
+                if comment_text and len(comment_text) > 2:
+                    steps.append(comment_text.rstrip(".") + ".")
+                continue
 
-        # igt_skip
-        msk = _STEP_SKIP_RE.search(line)
-        if msk:
-            steps.append("Skip if preconditions not met.")
-            continue
+        has_call = "(" in line
+        if has_call and "igt_" in line:
+            # igt_skip
+            msk = _STEP_SKIP_RE.search(line)
+            if msk:
+                steps.append("Skip if preconditions not met.")
+                continue
 
-        # igt_require
-        mreq = _STEP_REQUIRE_RE.search(line)
-        if mreq:
-            cond = mreq.group(1).rstrip(");").strip()
-            steps.append(f"Require `{cond}`.")
-            continue
+            # igt_require
+            mreq = _STEP_REQUIRE_RE.search(line)
+            if mreq:
+                cond = mreq.group(1).rstrip(");").strip()
+                steps.append(f"Require `{cond}`.")
+                continue
 
-        # igt_assert variants
-        ma = _STEP_ASSERT_RE.search(line)
-        if ma:
-            cond = ma.group(1).rstrip(");").strip()
-            if len(cond) > 80:
-                cond = cond[:77] + "..."
-            steps.append(f"Assert `{cond}`.")
-            continue
+            # igt_assert variants
+            ma = _STEP_ASSERT_RE.search(line)
+            if ma:
+                cond = ma.group(1).rstrip(");").strip()
+                if len(cond) > 80:
+                    cond = cond[:77] + "..."
+                steps.append(f"Assert `{cond}`.")
+                continue
 
         # igt_* / gem_* / kms_* / drm* calls
-        migt = _STEP_IGT_CALL_RE.search(line)
-        if migt:
-            func = migt.group(1)
-            steps.append(f"Call `{func}()`.")
-            continue
+        if has_call:
+            migt = _STEP_IGT_CALL_RE.search(line)
+            if migt:
+                func = migt.group(1)
+                steps.append(f"Call `{func}()`.")
+                continue
 
         # Variable assignment with function call
-        masn = _STEP_ASSIGN_RE.match(line)
-        if masn:
-            var = masn.group(1)
-            rhs = masn.group(2).strip().rstrip(";")
-            mf = _STEP_FUNC_CALL_RE.match(rhs)
-            if mf:
-                func = mf.group(1)
-                if func not in _STEP_IGNORE:
-                    steps.append(f"Set `{var}` from `{func}()`.")
-                    continue
+        if "=" in line:
+            masn = _STEP_ASSIGN_RE.match(line)
+            if masn:
+                var = masn.group(1)
+                rhs = masn.group(2).strip().rstrip(";")
+                mf = _STEP_FUNC_CALL_RE.match(rhs)
+                if mf:
+                    func = mf.group(1)
+                    if func not in _STEP_IGNORE:
+                        steps.append(f"Set `{var}` from `{func}()`.")
+                        continue
 
         # Generic function call
-        mfc = _STEP_FUNC_CALL_RE.match(line)
-        if mfc:
-            func = mfc.group(1)
-            if func not in _STEP_IGNORE and not func.startswith("__"):
-                steps.append(f"Call `{func}()`.")
-                continue
+        if has_call:
+            mfc = _STEP_FUNC_CALL_RE.match(line)
+            if mfc:
+                func = mfc.group(1)
+                if func not in _STEP_IGNORE and not func.startswith("__"):
+                    steps.append(f"Call `{func}()`.")
+                    continue
 
     return steps
 
@@ -1127,9 +1370,16 @@ def _find_block_end(lines, start, end):
     depth = 1
     i = start
     while i < end:
-        line = lines[i].strip()
+        line = lines[i]
+        # Most lines hold no brace at all: skip them before any regex or count
+        if "}" not in line:
+            if "{" in line:
+                depth += line.count("{")
+            i += 1
+            continue
+        line = line.strip()
         # Check for } else { or } else if — these close the current block
-        if depth == 1 and (_ELSE_COMBINED_RE.match(line) or _ELSE_IF_COMBINED_RE.match(line)):
+        if depth == 1 and _ELSE_CLOSE_RE.match(line):
             return i
         depth += line.count("{") - line.count("}")
         if depth <= 0:
@@ -1139,19 +1389,14 @@ def _find_block_end(lines, start, end):
 
 
 # Match } else { or } else if (...) { on the SAME line as closing brace
-_ELSE_IF_COMBINED_RE = re.compile(r"}\s*else\s+if\s*\((.+?)\)\s*\{?\s*$")
-_ELSE_COMBINED_RE = re.compile(r"}\s*else\s*\{?\s*$")
+# (only "} else if" captures "cond")
+_ELSE_CLOSE_RE = re.compile(r"}\s*else(?:\s+if\s*\((?P<cond>.+?)\))?\s*\{?\s*$")
 
 
 def _extract_subtest_bodies(source):
     """Find all igt_subtest("name") { ... } blocks and return {name: body}."""
     bodies = {}
-    # Match igt_subtest("name"), igt_subtest_f("name"...),
-    # and igt_subtest_with_dynamic("name")
-    pat = re.compile(
-        r'igt_subtest(?:_f|_with_dynamic(?:_f)?)?\s*\(\s*"([^"]+)"[^)]*\)\s*\{',
-    )
-    for m in pat.finditer(source):
+    for m in _IGT_SUBTEST_BODY_RE.finditer(source):
         name = m.group(1)
         brace_pos = m.end() - 1  # position of the opening {
         body = _extract_brace_body(source, brace_pos)
@@ -1159,19 +1404,116 @@ def _extract_subtest_bodies(source):
     return bodies
 
 
+# (filepath, extract_steps) -> ((mtime_ns, size), pickled IGTTestMeta)
+_igt_cache = {}
+
+
+def _file_stamp(filepath):
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def parse_igt_test_file(filepath, extract_steps=True):
+    stamp = _file_stamp(filepath)
+    if stamp is None:
+        return _parse_igt_test_file(filepath, extract_steps)
+    key = (filepath, extract_steps)
+    hit = _igt_cache.get(key)
+    if hit is not None and hit[0] == stamp:
+        return pickle.loads(hit[1])
+    test = _parse_igt_test_file(filepath, extract_steps)
+    _igt_cache[key] = (stamp, pickle.dumps(test, pickle.HIGHEST_PROTOCOL))
+    return test
+
+
+def _parse_igt_one(filepath, extract_steps=True):
+    # Returns the pickled test, ready to go into _igt_cache as is
+    try:
+        test = _parse_igt_test_file(filepath, extract_steps)
+        return pickle.dumps(test, pickle.HIGHEST_PROTOCOL), None
+    except Exception as exc:
+        return None, exc
+
+
+def parse_igt_test_files(filepaths, extract_steps=True, workers=None):
+    """Parse several IGT test files, yielding ``(filepath, test, error)`` in input order.
+
+    Files missing from parse_igt_test_file's cache are parsed in a process
+    pool first, like the regex backend in parse_files, and their results
+    are cached. If the pool can't start or breaks, they are parsed
+    serially. ``error`` is the exception a file raised (with ``test``
+    None), or None.
+    """
+    filepaths = list(filepaths)
+    workers = workers or os.cpu_count() or 1
+    stamps = {path: _file_stamp(path) for path in filepaths}
+    todo = []
+    for path in filepaths:
+        hit = _igt_cache.get((path, extract_steps))
+        if hit is None or hit[0] != stamps[path]:
+            todo.append(path)
+
+    if workers > 1 and len(todo) >= _PARALLEL_MIN_FILES:
+        parse = functools.partial(_parse_igt_one, extract_steps=extract_steps)
+        try:
+            with _process_pool(workers) as pool:
+                for path, (data, exc) in zip(todo, pool.map(parse, todo, chunksize=4)):
+                    if exc is None and stamps[path] is not None:
+                        _igt_cache[(path, extract_steps)] = (stamps[path], data)
+        except _POOL_ERRORS:
+            pass  # the loop below parses whatever the pool did not get to
+
+    # Whatever the pool did not cache (errors, small batches, a failed
+    # pool) is parsed here
+    for path in filepaths:
+        try:
+            test, exc = parse_igt_test_file(path, extract_steps), None
+        except Exception as e:
+            test, exc = None, e
+        yield path, test, exc
+
+
+def _read_igt_source(filepath):
+    """Return the decoded source of filepath, or None if it has no IGT markup.
+
+    Large files are probed through a read-only mapping first, so sources
+    with neither a doc comment nor an igt_* call are never decoded.
+    """
+    if os.path.getsize(filepath) >= _MMAP_MIN_SIZE:
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"/**") == -1 and mm.find(b"igt_") == -1:
+                return None
+            data = mm[:]
+        # Same result as a text-mode read: universal newlines, bad bytes replaced
+        return _NEWLINE_RE.sub("\n", data.decode("utf-8", errors="replace"))
+
     with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        source = f.read()
+        return f.read()
+
 
+def _parse_igt_test_file(filepath, extract_steps):
+    source = _read_igt_source(filepath)
     fname = os.path.basename(filepath)
-    test = None
+    if source is None:
+        return IGTTestMeta(name=os.path.splitext(fname)[0], filename=fname)
 
+    test = None
+    # First TEST: block is the main one; others may add standalone SUBTEST: entries
+    _standalone_subtests = {}  # name -> fields dict
     for m in _IGT_TEST_BLOCK_RE.finditer(source):
-        parsed = _parse_test_comment(m.group(1))
-        if parsed:
-            test = parsed
-            test.filename = fname
-            break
+        block_text = _parse_structured_comment(m.group(1))
+        if _IGT_MAIN_TEST_RE.search(block_text):
+            # Only blocks with a TEST: marker can parse as the main block
+            if test is None:
+                test = _parse_test_text(block_text)
+                if test:
+                    test.filename = fname
+            continue
+        if "SUBTEST:" in block_text:
+            _parse_standalone_subtests(block_text, _standalone_subtests)
 
     if test is None:
         stem = os.path.splitext(fname)[0]
@@ -1179,63 +1521,6 @@ def parse_igt_test_file(filepath, extract_steps=True):
 
     comment_subtests = {s.name for s in test.subtests}
 
-    # Scan all /** ... */ comment blocks for standalone SUBTEST: entries
-    # These may contain descriptions and fields not in the main TEST block
-    _standalone_subtests = {}  # name -> fields dict
-    for m in _IGT_TEST_BLOCK_RE.finditer(source):
-        block_text = _parse_structured_comment(m.group(1))
-        if re.search(r"(?<!\bSUB)TEST:", block_text):
-            continue  # Skip the main TEST block, already parsed
-        if "SUBTEST:" not in block_text:
-            continue
-        # Parse this standalone SUBTEST block
-        current_name = None
-        current_key = None
-        current_fields = None
-        for bline in block_text.split("\n"):
-            stripped = bline.strip()
-            if stripped.startswith("SUBTEST:"):
-                if current_name and current_fields:
-                    _flush_multiline(current_fields, current_key)
-                    _standalone_subtests[current_name] = current_fields
-                current_name = stripped[len("SUBTEST:") :].strip()
-                if "%s" in current_name or "%d" in current_name or "%u" in current_name:
-                    current_name = None
-                    current_fields = None
-                    current_key = None
-                    continue
-                current_fields = {}
-                current_key = None
-                continue
-            if current_fields is None:
-                continue
-            if ":" in stripped:
-                key, _, val = stripped.partition(":")
-                key_raw = key.strip()
-                key_clean = key_raw.lower().replace(" ", "_")
-                word_count = len(key_raw.split())
-                if key_clean and word_count <= 3 and re.match(r"^[\w\s-]+$", key_raw):
-                    _flush_multiline(current_fields, current_key)
-                    val = val.strip()
-                    if val:
-                        current_fields[key_clean] = val
-                        current_key = None
-                    else:
-                        current_fields[key_clean] = ""
-                        current_key = key_clean
-                    continue
-            # Continuation line
-            if stripped and current_key and current_fields is not None:
-                existing = current_fields.get(current_key, "")
-                current_fields[current_key] = (existing + " " + stripped).strip()
-                continue
-            if not stripped and current_key:
-                _flush_multiline(current_fields, current_key)
-                current_key = None
-        if current_name and current_fields:
-            _flush_multiline(current_fields, current_key)
-            _standalone_subtests[current_name] = current_fields
-
     lines = source.split("\n")
     pending_desc = None
     pending_describe_buf = None  # For multi-line igt_describe
@@ -1246,7 +1531,7 @@ def parse_igt_test_file(filepath, extract_steps=True):
             # Check if the line completes the igt_describe call
             if ")" in line and '"' in pending_describe_buf:
                 # Extract all quoted strings and join them
-                parts = re.findall(r'"([^"]*)"', pending_describe_buf)
+                parts = _QUOTED_STRING_RE.findall(pending_describe_buf)
                 if parts:
                     pending_desc = "".join(parts)
                 pending_describe_buf = None
@@ -1258,7 +1543,7 @@ def parse_igt_test_file(filepath, extract_steps=True):
             continue
 
         # Detect start of multi-line igt_describe (opening paren + quote but no closing)
-        dm_start = re.search(r'igt_describe\s*\(\s*"([^"]*)"?\s*$', line)
+        dm_start = _IGT_DESCRIBE_START_RE.search(line)
         if dm_start:
             pending_describe_buf = line.strip()
             continue
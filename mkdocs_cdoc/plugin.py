@@ -10,10 +10,16 @@ catalog generation when configured.
 from __future__ import annotations
 
 import fnmatch
+import functools
+import html
 import logging
 import os
 import re
-from dataclasses import dataclass, field
+import stat
+import sys
+import textwrap
+from dataclasses import dataclass, field, replace
+from operator import itemgetter
 from mkdocs.config import config_options
 from mkdocs.config.base import Config as MkDocsConfig
 from mkdocs.plugins import BasePlugin
@@ -23,10 +29,12 @@ from .parser import (
     SymbolKind,
     parse_file,
     parse_file_regex,
+    parse_files,
     CLANG_AVAILABLE,
     gtkdoc_to_rst,
     IGTTestMeta,
     parse_igt_test_file,
+    parse_igt_test_files,
 )
 from .renderer import (
     RenderConfig,
@@ -63,6 +71,13 @@ _CPP_EXTS = frozenset({".cpp", ".hpp", ".cc", ".hh", ".cxx", ".hxx"})
 def _render_steps_html(steps):
     """Render a list of step items (strings or if-tuples) to HTML."""
     parts = ["<ol>"]
+    _emit_steps(parts, steps)
+    parts.append("</ol>")
+    return "".join(parts)
+
+
+def _emit_steps(parts, steps):
+    # Nested conditionals append to the caller's parts list
     for item in steps:
         if isinstance(item, tuple) and item[0] == "if":
             _, condition, children = item
@@ -75,30 +90,31 @@ def _render_steps_html(steps):
                 )
             for child in children:
                 if isinstance(child, tuple) and child[0] == "if":
-                    parts.append(_render_steps_html([child]))
+                    parts.append("<ol>")
+                    _emit_steps(parts, [child])
+                    parts.append("</ol>")
                 else:
                     parts.append(f"<li>{child}</li>")
         else:
             parts.append(f"<li>{item}</li>")
-    parts.append("</ol>")
-    return "".join(parts)
 
 
+# Searched over the whole file at once, so the gaps must not run across
+# line breaks: the version has to sit on the same line as its key
 _VERSION_RE = re.compile(
-    r"""['"]?(?:version|VERSION|Version)['"]?\s*[:=]\s*['"]?(\d+\.\d+(?:\.\d+)?)['"]?"""
+    r"""['"]?(?:version|VERSION|Version)['"]?[^\S\n]*[:=][^\S\n]*['"]?(\d+\.\d+(?:\.\d+)?)['"]?"""
 )
 
 
 def _read_version(filepath):
     try:
         with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-            for line in f:
-                m = _VERSION_RE.search(line)
-                if m:
-                    return m.group(1)
+            text = f.read()
     except OSError as exc:
         log.warning("cdoc: cannot read version file %s: %s", filepath, exc)
-    return None
+        return None
+    m = _VERSION_RE.search(text)
+    return m.group(1) if m else None
 
 
 _RST_XREF_RE = re.compile(
@@ -109,9 +125,31 @@ _BACKTICK_IDENT_RE = re.compile(r"(?<!\[)`(\w[\w-]*)`(?!\])")
 _BACKTICK_FILE_RE = re.compile(
     r"(?<!\[)`([\w][\w.-]*/[\w][\w.-]*\.[\w]+|[\w][\w.-]*\.(?:c|h|cpp|hpp|cc|hh|cxx|hxx))`(?!\])"
 )
+# Example cards are kept safe from cross-reference rewriting
+_EXAMPLE_CARD_RE = re.compile(r'<div class="hm-example">.*?</div>', re.DOTALL)
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+# render_doc wraps the HowTo/Notes it found in a comment in these markers
+_APPENDIX_START = "<!-- APPENDIX_RENDER_START -->"
+_APPENDIX_END = "<!-- APPENDIX_RENDER_END -->"
+# Placeholder _apply_xrefs swaps in for each example card while xrefs run
+_PROTECTED_KEY_RE = re.compile(r"\x00HMEX\d+\x00")
+
+# Call sites for the usage appendix: an identifier followed by "(", and the
+# declaration shape that marks the line as the function's own definition
+_CALL_RE = re.compile(r"\b(\w+)\s*\(")
+_WORD_RE = re.compile(r"\w+")
+_DEF_PREFIX = (
+    r"^\s*(?:static\s+|extern\s+|inline\s+|__\w+\s+)*"
+    r"(?:(?:const|unsigned|signed|long|short|struct|enum|union)\s+)*"
+    r"\w[\w\s*]+\b"
+)
 
+# One SymbolEntry is kept per symbol and subtest, so drop the per-instance
+# __dict__ where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class SymbolEntry:
     name: str
     kind: SymbolKind
@@ -120,7 +158,7 @@ class SymbolEntry:
     group_title: str = ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SourceGroup:
     root: str
     nav_title: str = "API Reference"
@@ -172,25 +210,159 @@ class CdocConfig(MkDocsConfig):
     test_fields = config_options.Type(list, default=[])
     appendix_code_usages = config_options.Type(bool, default=False)
     extract_test_steps = config_options.Type(bool, default=False)
+    parse_jobs = config_options.Type(int, default=1)
+
+
+def _exclude_matcher(exclude):
+    """Compile exclude globs into one match function, or None if there are none.
+
+    Equivalent to trying fnmatch.fnmatch with each pattern in turn, but the
+    patterns are translated and compiled once per discovery instead of
+    being looked up in fnmatch's cache for every file.
+    """
+    if not exclude:
+        return None
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in exclude)).match
 
 
-def _discover_sources(root, extensions, exclude):
+def _discover_sources(root, extensions, exclude, stamps=None):
+    """Return the relative paths of the sources under root, in walk order.
+
+    If stamps is a dict, the (mtime_ns, size) of each regular file found is
+    recorded in it, keyed by normalized absolute path.
+    """
     out = []
-    exts = [e if e.startswith(".") else f".{e}" for e in extensions]
-    for dirpath, _, fnames in os.walk(root):
-        for fn in sorted(fnames):
-            _, ext = os.path.splitext(fn)
-            if ext.lower() not in exts:
-                continue
-            rel = os.path.relpath(os.path.join(dirpath, fn), root)
-            if any(fnmatch.fnmatch(fn, p) or fnmatch.fnmatch(rel, p) for p in exclude):
-                continue
-            out.append(rel)
+    exts = frozenset(e if e.startswith(".") else f".{e}" for e in extensions)
+    _scan_sources(root, "", exts, _exclude_matcher(exclude), out, stamps)
     return out
 
 
+def _scan_sources(path, prefix, exts, excluded, out, stamps=None):
+    # Walks like os.walk (top-down, unreadable directories skipped, symlinked
+    # directories not followed), but builds each relative path from the
+    # parent's prefix rather than calling os.path.relpath per file
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirs = []
+    files = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            files.append((entry.name, entry))
+        elif not entry.is_symlink():
+            subdirs.append(entry.name)
+    for fn, entry in sorted(files, key=lambda f: f[0]):
+        _, ext = os.path.splitext(fn)
+        if ext.lower() not in exts:
+            continue
+        rel = prefix + fn
+        if excluded and (excluded(os.path.normcase(fn)) or excluded(os.path.normcase(rel))):
+            continue
+        out.append(rel)
+        if stamps is not None:
+            # The walk already holds the entry, so stat it here once rather
+            # than stat'ing the path again for every isfile/cache check
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                stamps[os.path.normpath(entry.path)] = (st.st_mtime_ns, st.st_size)
+    for name in subdirs:
+        _scan_sources(os.path.join(path, name), prefix + name + os.sep, exts, excluded, out, stamps)
+
+
+# (backend, path, clang_args) -> ((mtime_ns, size), docs). Kept at module
+# level so that mkdocs serve rebuilds, which configure fresh plugin
+# instances, skip re-parsing sources that have not changed.
+_parse_cache = {}
+
+
+def _parse_cache_key(backend, path, clang_args):
+    # Only libclang output depends on the compiler arguments
+    return backend, path, tuple(clang_args or ()) if backend is parse_file else ()
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def _source_rel_to_md_uri(rel, output_dir):
-    return f"{output_dir}/{rel.replace(os.sep, '/')}.md"
+    return f"{output_dir}/{_source_rel_to_md_link(rel)}"
+
+
+def _source_rel_to_md_link(rel):
+    """Link to a source's page from its group's index, i.e. relative to output_dir."""
+    return f"{rel.replace(os.sep, '/')}.md"
+
+
+def _group_by_md_uri(field_name, output_dir):
+    """Return the URI of the "By <field>" index page of an IGT group."""
+    slug = field_name.lower().replace(" ", "_").replace("-", "_")
+    return f"{output_dir}/by-{slug}.md"
+
+
+@functools.lru_cache(maxsize=256)
+def _field_keys(name):
+    # Spellings CdocPlugin._get_field tries, in order:
+    # sub_category <-> sub-category <-> Sub category
+    return (
+        name,
+        name.replace("_", "-"),
+        name.replace("-", "_"),
+        name.replace("_", " "),
+        name.replace("-", " "),
+    )
+
+
+def _brace_depths(lines):
+    """Return the running brace depth before each line, plus the total at the end.
+
+    depth[j] is the number of "{" minus "}" in lines[:j], so the balance of
+    any line range is a difference of two entries.
+    """
+    depth = [0]
+    total = 0
+    for line in lines:
+        total += line.count("{") - line.count("}")
+        depth.append(total)
+    return depth
+
+
+# Pages link to the same few targets over and over; the relative URL only
+# depends on the two page URIs
+@functools.lru_cache(maxsize=4096)
+def _page_rel_url(target, current_page_uri, use_dir_urls):
+    """Return the URL of page target relative to page current_page_uri."""
+    # When use_directory_urls is true, pages are served as
+    # foo/bar.c.md -> foo/bar.c/index.html
+    # So we need to compute relative paths between directory URLs
+    if use_dir_urls:
+        # Convert .md paths to directory paths for relpath calculation
+        # "api/lib/igt_aux.c.md" -> "api/lib/igt_aux.c/"
+        target_dir = target.removesuffix(".md") + "/"
+        # index.md files are served as the directory root, so
+        # "api/core/index.md" is served at "api/core/" not
+        # "api/core/index/". Use the containing directory.
+        if current_page_uri.endswith("/index.md") or current_page_uri == "index.md":
+            current_dir = os.path.dirname(current_page_uri) + "/"
+        else:
+            current_dir = current_page_uri.removesuffix(".md") + "/"
+        from_dir = current_dir  # we're "inside" this directory
+        rel = os.path.relpath(target_dir.rstrip("/"), from_dir.rstrip("/"))
+        return rel.replace(os.sep, "/") + "/"
+    from_dir = os.path.dirname(current_page_uri)
+    return os.path.relpath(target, from_dir).replace(os.sep, "/")
 
 
 class CdocPlugin(BasePlugin[CdocConfig]):
@@ -198,19 +370,33 @@ class CdocPlugin(BasePlugin[CdocConfig]):
     def __init__(self):
         super().__init__()
         self._cache = {}
+        self._prefetched = {}
         self._groups = []
         self._pages = {}
+        self._page_uris = {}  # source abspath -> first page uri registered for it
         self._tmpfiles = []
+        self._file_lines = {}
+        self._file_depths = {}
+        self._call_index = None
+        self._stamps = {}
         self._symbols = {}
-        self._symbol_names = set()
         self._ambiguous_files = set()
+        # Derived from _symbols; emptied by _symbols_changed
+        self._letters_cache = {}
+        self._symbols_by_group = None
         self._use_dir_urls = True
         self._version = None
         self._render_count = 0
 
     # ── Symbol registry ──
 
+    def _symbols_changed(self):
+        """Drop everything computed from the symbol registry."""
+        self._letters_cache.clear()
+        self._symbols_by_group = None
+
     def _register_symbols(self, docs, page_uri, group=None):
+        self._symbols_changed()
         gtitle = group.nav_title if group else ""
         for doc in docs:
             aid = anchor_id(doc)
@@ -219,7 +405,6 @@ class CdocPlugin(BasePlugin[CdocConfig]):
             )
             if doc.name not in self._symbols:
                 self._symbols[doc.name] = entry
-                self._symbol_names.add(doc.name)
             for member in doc.members:
                 maid = anchor_id(member)
                 mentry = SymbolEntry(
@@ -232,9 +417,7 @@ class CdocPlugin(BasePlugin[CdocConfig]):
                 qualified = f"{doc.name}.{member.name}"
                 if member.name not in self._symbols:
                     self._symbols[member.name] = mentry
-                    self._symbol_names.add(member.name)
                 self._symbols[qualified] = mentry
-                self._symbol_names.add(qualified)
 
     def _resolve_xref(self, name, current_page_uri=None):
         clean = name.strip()
@@ -244,37 +427,17 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         entry = self._symbols.get(clean)
         if not entry:
             return None
+        return self._entry_url(entry, clean, current_page_uri)
 
+    def _entry_url(self, entry, clean, current_page_uri=None):
+        """Return the URL of a registered symbol's anchor as seen from current_page_uri."""
         target = entry.page_uri
         anchor = entry.anchor
         if current_page_uri and target == current_page_uri:
             return f"#{anchor}" if anchor else ""
 
         if current_page_uri:
-            # When use_directory_urls is true, pages are served as
-            # foo/bar.c.md -> foo/bar.c/index.html
-            # So we need to compute relative paths between directory URLs
-            if self._use_dir_urls:
-                # Convert .md paths to directory paths for relpath calculation
-                # "api/lib/igt_aux.c.md" -> "api/lib/igt_aux.c/"
-                target_dir = target.removesuffix(".md") + "/"
-                # index.md files are served as the directory root, so
-                # "api/core/index.md" is served at "api/core/" not
-                # "api/core/index/". Use the containing directory.
-                if current_page_uri.endswith("/index.md") or current_page_uri == "index.md":
-                    current_dir = os.path.dirname(current_page_uri) + "/"
-                else:
-                    current_dir = current_page_uri.removesuffix(".md") + "/"
-                from_dir = current_dir  # we're "inside" this directory
-                rel = (
-                    os.path.relpath(target_dir.rstrip("/"), from_dir.rstrip("/")).replace(
-                        os.sep, "/"
-                    )
-                    + "/"
-                )
-            else:
-                from_dir = os.path.dirname(current_page_uri)
-                rel = os.path.relpath(target, from_dir).replace(os.sep, "/")
+            rel = _page_rel_url(target, current_page_uri, self._use_dir_urls)
         else:
             rel = target
 
@@ -284,8 +447,6 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         return rel
 
     def _apply_xrefs(self, markdown, current_page_uri=None):
-        # Keep example cards safe from cross-reference rewriting
-        _EXAMPLE_CARD_RE = re.compile(r'<div class="hm-example">.*?</div>', re.DOTALL)
         protected = {}
         counter = [0]
 
@@ -310,9 +471,9 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         if self.config["auto_xref"]:
             text = self._auto_xref_backticks(text, current_page_uri)
 
-        # Put the example cards back
-        for key, val in protected.items():
-            text = text.replace(key, val)
+        # Put the example cards back, all in one pass over the page
+        if protected:
+            text = _PROTECTED_KEY_RE.sub(lambda m: protected.get(m.group(0), m.group(0)), text)
 
         # MkDocs skips markdown inside raw HTML, so we convert
         # links and backtick spans to proper HTML ourselves
@@ -328,9 +489,16 @@ class CdocPlugin(BasePlugin[CdocConfig]):
 
     def _md_links_in_html(self, text):
         """Convert markdown links and backtick spans to HTML inside HTML blocks."""
+        # Every block marker below starts with "<"; pages without one have
+        # no HTML blocks, and outside a block only such lines need a look
+        if "<" not in text:
+            return text
         result = []
         in_html = False
         for line in text.split("\n"):
+            if not in_html and "<" not in line:
+                result.append(line)
+                continue
             stripped = line.strip()
             # Track HTML block context
             if stripped.startswith(
@@ -342,12 +510,13 @@ class CdocPlugin(BasePlugin[CdocConfig]):
 
             if in_html:
                 # Convert [`text`](url) and [text](url) → <a href><code>text</code></a>
-                if self._MD_LINK_RE.search(line):
+                if "](" in line:
                     line = self._MD_LINK_RE.sub(
                         lambda m: f'<a href="{m.group(2)}"><code>{m.group(1)}</code></a>', line
                     )
                 # Convert remaining `text` backtick spans → <code>text</code>
-                line = re.sub(r"`([^`]+)`", r"<code>\1</code>", line)
+                if "`" in line:
+                    line = _INLINE_CODE_RE.sub(r"<code>\1</code>", line)
 
             if stripped.startswith(("</table", "</div>")):
                 in_html = False
@@ -385,34 +554,34 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         return "\n".join(result)
 
     def _auto_xref_backticks(self, text, current_page_uri=None):
-        def replace_file(m):
+        # The captured names carry no spaces or "()", so each span costs a
+        # single registry lookup instead of going through _resolve_xref
+        symbols = self._symbols
+
+        def replace_name(m):
             name = m.group(1)
-            if name not in self._symbol_names:
-                return m.group(0)
-            url = self._resolve_xref(name, current_page_uri)
+            entry = symbols.get(name)
+            url = entry and self._entry_url(entry, name, current_page_uri)
             if url:
                 return f"[`{name}`]({url})"
             return m.group(0)
 
         def replace_func(m):
             name = m.group(1)
-            url = self._resolve_xref(name, current_page_uri)
+            entry = symbols.get(name)
+            url = entry and self._entry_url(entry, name, current_page_uri)
             if url:
                 return f"[`{name}()`]({url})"
             return m.group(0)
 
-        def replace_ident(m):
-            name = m.group(1)
-            if name not in self._symbol_names:
-                return m.group(0)
-            url = self._resolve_xref(name, current_page_uri)
-            if url:
-                return f"[`{name}`]({url})"
-            return m.group(0)
-
-        text = _BACKTICK_FILE_RE.sub(replace_file, text)
-        text = _BACKTICK_FUNC_RE.sub(replace_func, text)
-        text = _BACKTICK_IDENT_RE.sub(replace_ident, text)
+        # Each pass sees the links made by the one before, so they stay
+        # separate passes; skip those that cannot match at all
+        if "`" not in text:
+            return text
+        text = _BACKTICK_FILE_RE.sub(replace_name, text)
+        if "()`" in text:
+            text = _BACKTICK_FUNC_RE.sub(replace_func, text)
+        text = _BACKTICK_IDENT_RE.sub(replace_name, text)
         return text
 
     # ── Appendix: "Referenced by" code examples ──
@@ -420,65 +589,122 @@ class CdocPlugin(BasePlugin[CdocConfig]):
     def _extract_code_usages(self, func_name, group, max_results=3):
         """Find up to max_results call sites of func_name across all source groups."""
         usages = []
-        call_pat = re.compile(r"\b" + re.escape(func_name) + r"\s*\(")
+        if _WORD_RE.fullmatch(func_name):
+            if self._call_index is None:
+                self._call_index = self._build_call_index()
+            sites = self._call_index.get(func_name, ())
+        else:
+            call_pat = re.compile(r"\b" + re.escape(func_name) + r"\s*\(")
+            sites = (
+                (abspath, rel, i)
+                for abspath, rel, lines in self._source_files()
+                for i in self._call_site_lines(lines)
+                if call_pat.search(lines[i])
+            )
+
+        def_pat = None
+        for abspath, rel, i in sites:
+            lines = self._file_lines[abspath]
+            if def_pat is None:
+                def_pat = re.compile(_DEF_PREFIX + re.escape(func_name) + r"\s*\(")
+            # Skip function declarations/definitions (the function itself)
+            if def_pat.match(lines[i].strip()):
+                continue
+
+            depth = self._file_depths.get(abspath)
+            if depth is None:
+                depth = self._file_depths[abspath] = _brace_depths(lines)
+            snippet_lines, start_line = self._extract_snippet(lines, i, depth=depth)
+            if snippet_lines:
+                usages.append((rel, start_line + 1, snippet_lines))
+                if len(usages) >= max_results:
+                    return usages
+        return usages
+
+    def _source_files(self):
+        """Yield (abspath, rel, lines) for every readable discovered source."""
         for g in self._groups:
             for rel in g.discovered:
                 abspath = os.path.join(g.root, rel)
-                try:
-                    with open(abspath, "r", encoding="utf-8", errors="replace") as f:
-                        lines = f.readlines()
-                except OSError:
-                    continue
+                lines = self._read_lines(abspath)
+                if lines is not None:
+                    yield abspath, rel, lines
 
-                for i, line in enumerate(lines):
-                    if not call_pat.search(line):
-                        continue
-                    stripped = line.strip()
+    @staticmethod
+    def _call_site_lines(lines):
+        """Yield the indices of lines that may hold a call worth showing.
+
+        Comment lines, lines inside block comments and preprocessor lines
+        are skipped; none of that depends on which function is looked up.
+        """
+        for i, line in enumerate(lines):
+            if "(" not in line:
+                continue
+            stripped = line.strip()
 
-                    # Skip doc comments and comment lines
-                    if stripped.startswith(("*", "/*", "//", "/**")):
-                        continue
-                    # Skip lines inside block comments
+            # Skip doc comments, comment lines and #define lines (macro definitions)
+            if stripped.startswith(("*", "/*", "//", "#")):
+                continue
+            # Skip lines inside block comments
+            in_comment = False
+            for j in range(max(0, i - 5), i):
+                lj = lines[j].strip()
+                if "/*" in lj:
+                    in_comment = True
+                if "*/" in lj:
                     in_comment = False
-                    for j in range(max(0, i - 5), i):
-                        lj = lines[j].strip()
-                        if "/*" in lj:
-                            in_comment = True
-                        if "*/" in lj:
-                            in_comment = False
-                    if in_comment:
-                        continue
-
-                    # Skip function declarations/definitions (the function itself)
-                    if re.match(
-                        r"^\s*(?:static\s+|extern\s+|inline\s+|__\w+\s+)*"
-                        r"(?:(?:const|unsigned|signed|long|short|struct|enum|union)\s+)*"
-                        r"\w[\w\s*]+\b" + re.escape(func_name) + r"\s*\(",
-                        stripped,
-                    ):
-                        continue
-                    # Skip #define lines (macro definitions)
-                    if stripped.startswith("#"):
-                        continue
-
-                    snippet_lines, start_line = self._extract_snippet(lines, i)
-                    if snippet_lines:
-                        usages.append((rel, start_line + 1, snippet_lines))
-                        if len(usages) >= max_results:
-                            return usages
-        return usages
+            if in_comment:
+                continue
+            yield i
+
+    def _build_call_index(self):
+        """Map each called identifier to its (abspath, rel, line index) call sites.
+
+        Sites are listed in group, file and line order, so scanning one
+        name's list visits them in the same order as a scan of every file.
+        """
+        index = {}
+        for abspath, rel, lines in self._source_files():
+            for i in self._call_site_lines(lines):
+                site = (abspath, rel, i)
+                for name in set(_CALL_RE.findall(lines[i])):
+                    index.setdefault(name, []).append(site)
+        return index
+
+    def _read_lines(self, abspath):
+        """Return the lines of abspath, or None if it can't be read.
+
+        Every documented function searches every source file for call
+        sites, so the lines are kept until the end of the build.
+        """
+        try:
+            return self._file_lines[abspath]
+        except KeyError:
+            pass
+        try:
+            with open(abspath, "r", encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+        except OSError:
+            lines = None
+        self._file_lines[abspath] = lines
+        return lines
 
-    def _extract_snippet(self, lines, call_idx, context=12):
-        """Extract a code snippet around a function call, bounded by the enclosing block."""
+    def _extract_snippet(self, lines, call_idx, context=12, depth=None):
+        """Extract a code snippet around a function call, bounded by the enclosing block.
+
+        depth is the _brace_depths of lines; pass it when extracting several
+        snippets from the same file so the braces are only counted once.
+        """
         total = len(lines)
+        if depth is None:
+            depth = _brace_depths(lines)
 
-        # Walk backwards to find enclosing function/block start
+        # Walk backwards to find enclosing function/block start: the first
+        # line j from which lines j..call_idx close more braces than they open
         start = call_idx
-        brace_depth = 0
+        call_depth = depth[call_idx + 1]
         for j in range(call_idx, max(-1, call_idx - 80), -1):
-            s = lines[j]
-            brace_depth += s.count("}") - s.count("{")
-            if brace_depth < 0:
+            if depth[j] < call_depth:
                 # Found opening brace of enclosing block
                 # Look one more line back for the function signature
                 if (
@@ -493,13 +719,12 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         else:
             start = max(0, call_idx - context)
 
-        # Walk forwards to find end of the statement/block
+        # Walk forwards to find end of the statement/block: the first line
+        # after the call where everything opened since start is closed
         end = call_idx
-        brace_depth = 0
+        start_depth = depth[start]
         for j in range(start, min(total, call_idx + 80)):
-            s = lines[j]
-            brace_depth += s.count("{") - s.count("}")
-            if j > call_idx and brace_depth <= 0:
+            if j > call_idx and depth[j + 1] <= start_depth:
                 end = j
                 break
         else:
@@ -514,8 +739,6 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         snippet = [ln.rstrip("\n") for ln in lines[start : end + 1]]
         # Dedent
         if snippet:
-            import textwrap
-
             snippet = textwrap.dedent("\n".join(snippet)).split("\n")
         # Strip leading/trailing blank lines
         while snippet and not snippet[0].strip():
@@ -534,8 +757,7 @@ class CdocPlugin(BasePlugin[CdocConfig]):
 
         parts = ["", "#### Example usage in code", "", '<div class="hm-appendix">', ""]
         for rel, line_no, snippet in code_usages:
-            code_text = "\n".join(snippet)
-            code_text = code_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            code_text = html.escape("\n".join(snippet), quote=False)
             label_text = f"{rel}:{line_no}"
             card = (
                 f'<div class="hm-example">'
@@ -550,12 +772,17 @@ class CdocPlugin(BasePlugin[CdocConfig]):
     # ── gtk-doc comment conversion ──
 
     def _convert_comments(self, docs):
+        """Return docs with gtk-doc comments converted; docs itself is left untouched."""
         if not self.config["convert_gtkdoc"]:
-            return
-        for doc in docs:
-            doc.comment = gtkdoc_to_rst(doc.comment)
-            for member in doc.members:
-                member.comment = gtkdoc_to_rst(member.comment)
+            return docs
+        return [
+            replace(
+                doc,
+                comment=gtkdoc_to_rst(doc.comment),
+                members=[replace(m, comment=gtkdoc_to_rst(m.comment)) for m in doc.members],
+            )
+            for doc in docs
+        ]
 
     # ── Source group configuration ──
 
@@ -641,20 +868,26 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         if not os.path.isdir(group.root):
             log.error("cdoc: source root missing: %s", group.root)
             return
-        group.discovered = _discover_sources(group.root, group.extensions, group.exclude)
+        group.discovered = _discover_sources(
+            group.root, group.extensions, group.exclude, self._stamps
+        )
         log.info("cdoc: [%s] %d files in %s", group.nav_title, len(group.discovered), group.root)
+        self._prefetch(
+            [os.path.normpath(os.path.join(group.root, rel)) for rel in group.discovered], group
+        )
 
         for rel in group.discovered:
             uri = _source_rel_to_md_uri(rel, group.output_dir)
             abspath = os.path.normpath(os.path.join(group.root, rel))
             group.generated_pages[uri] = abspath
             self._pages[uri] = (abspath, group)
+            self._page_uris.setdefault(abspath, uri)
 
             docs = self._parse(abspath, group)
             self._register_file_symbol(rel, uri, group)
 
             if group.test_mode == "igt":
-                tmeta = parse_igt_test_file(abspath, extract_steps=group.extract_test_steps)
+                tmeta = self._parse_test(abspath, group)
                 group.test_metas[rel] = tmeta
                 self._register_test_symbols(tmeta, uri, group)
                 # Only register parsed symbols (functions, structs, etc.)
@@ -673,12 +906,12 @@ class CdocPlugin(BasePlugin[CdocConfig]):
 
         if group.test_mode == "igt" and group.test_group_by:
             for field_name in group.test_group_by:
-                slug = field_name.lower().replace(" ", "_").replace("-", "_")
-                guri = f"{group.output_dir}/by-{slug}.md"
+                guri = _group_by_md_uri(field_name, group.output_dir)
                 group.generated_pages[guri] = f"__GROUP__{field_name}"
                 self._pages[guri] = (f"__GROUP__{field_name}", group)
 
     def _register_test_symbols(self, tmeta, page_uri, group):
+        self._symbols_changed()
         gtitle = group.nav_title if group else ""
         tanchor = f"test-{tmeta.name}"
         tentry = SymbolEntry(
@@ -690,7 +923,6 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         )
         if tmeta.name not in self._symbols:
             self._symbols[tmeta.name] = tentry
-            self._symbol_names.add(tmeta.name)
 
         for sub in tmeta.subtests:
             sanchor = f"subtest-{sub.name}"
@@ -703,12 +935,11 @@ class CdocPlugin(BasePlugin[CdocConfig]):
                 group_title=gtitle,
             )
             self._symbols[qualified] = sentry
-            self._symbol_names.add(qualified)
             if sub.name not in self._symbols:
                 self._symbols[sub.name] = sentry
-                self._symbol_names.add(sub.name)
 
     def _register_file_symbol(self, rel, page_uri, group):
+        self._symbols_changed()
         gtitle = group.nav_title if group else ""
         basename = os.path.basename(rel)
         # Qualified form: group_output_dir_basename/filename e.g. "core/engine.h"
@@ -720,19 +951,16 @@ class CdocPlugin(BasePlugin[CdocConfig]):
         )
         # Always register qualified form
         self._symbols[qualified] = entry
-        self._symbol_names.add(qualified)
         # Register bare name only if unique and not already ambiguous
         if basename in self._ambiguous_files:
             pass
         elif basename not in self._symbols:
             self._symbols[basename] = entry
-            self._symbol_names.add(basename)
         else:
             existing = self._symbols[basename]
             if existing.kind == SymbolKind.FILE and existing.page_uri != page_uri:
                 # Ambiguous — remove bare name so only qualified works
                 del self._symbols[basename]
-                self._symbol_names.discard(basename)
                 # Mark as ambiguous so we don't re-add later
                 self._ambiguous_files.add(basename)
 
@@ -742,9 +970,8 @@ class CdocPlugin(BasePlugin[CdocConfig]):
             nav.append({"Overview": f"{group.output_dir}/index.md"})
         if group.test_mode == "igt" and group.test_group_by:
             for field_name in group.test_group_by:
-                slug = field_name.lower().replace(" ", "_").replace("-", "_")
                 label = field_name.replace("_", " ").title()
-                nav.append({f"By {label}": f"{group.output_dir}/by-{slug}.md"})
+                nav.append({f"By {label}": _group_by_md_uri(field_name, group.output_dir)})
         for page_entry in group.pages:
             if isinstance(page_entry, dict):
                 nav.append(page_entry)
@@ -808,11 +1035,17 @@ class CdocPlugin(BasePlugin[CdocConfig]):
             log.info("cdoc: using regex parser (clang skipped)")
 
         self._cache.clear()
+        self._prefetched.clear()
         self._pages.clear()
+        self._page_uris.clear()
         self._tmpfiles.clear()
+        self._file_lines.clear()
+        self._file_depths.clear()
+        self._call_index = None
+        self._stamps.clear()
         self._symbols.clear()
-        self._symbol_names.clear()
         self._ambiguous_files.clear()
+        self._symbols_changed()
         self._render_count = 0
         self._groups = self._build_groups(config_dir)
         self._config_dir = config_dir
@@ -945,7 +1178,10 @@ class CdocPlugin(BasePlugin[CdocConfig]):
                 md = self._mk_page(target, group)
             return self._apply_xrefs(md, src_uri)
 
-        md = _DIRECTIVE_RE.sub(lambda m: self._handle_directive(m, page), markdown)
+        md = markdown
+        # Every directive starts with ":::"; most hand-written pages have none
+        if ":::" in md:
+            md = _DIRECTIVE_RE.sub(lambda m: self._handle_directive(m, page), md)
         return self._apply_xrefs(md, src_uri)
 
     def on_post_build(self, *, config, **kwargs):
@@ -962,9 +1198,16 @@ class CdocPlugin(BasePlugin[CdocConfig]):
                 except OSError:
                     break
                 d = os.path.dirname(d)
+        self._file_lines.clear()
+        self._file_depths.clear()
+        self._call_index = None
+        self._stamps.clear()
 
     # ── A–Z navigation bar ──
 
+    # Letters without symbols render the same on every page
+    _AZ_INACTIVE = {ch: f'<span class="x">{ch}</span>' for ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"}
+
     _AZ_CSS = """<style>
 .hm-idx{position:sticky;top:var(--md-header-height,0);z-index:2;
 background:var(--md-default-bg-color,#fff);border-bottom:1px solid rgba(128,128,128,.2);
@@ -1012,11 +1255,21 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
 </style>"""
 
     def _group_symbols(self, group):
-        return {n: e for n, e in self._symbols.items() if e.group_title == group.nav_title}
+        """Return the {name: entry} registry slice of group; treat it as read-only."""
+        if self._symbols_by_group is None:
+            # One pass buckets every group, keeping registry order within each
+            buckets = {}
+            for n, e in self._symbols.items():
+                buckets.setdefault(e.group_title, {})[n] = e
+            self._symbols_by_group = buckets
+        return self._symbols_by_group.get(group.nav_title, {})
 
     def _active_letters(self, group):
+        letters = self._letters_cache.get(group.nav_title)
+        if letters is not None:
+            return letters
         syms = self._group_symbols(group)
-        letters = set()
+        letters = self._letters_cache[group.nav_title] = set()
         for n, e in syms.items():
             if not n or "@" in n or "/" in n or e.kind == SymbolKind.FILE:
                 continue
@@ -1027,26 +1280,28 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
 
     def _az_bar(self, group, index_uri=None, current_uri=None, use_directory_urls=True):
         active = self._active_letters(group)
+        # Every letter links to the same index page, so resolve it once
+        prefix = "#"
+        if index_uri and current_uri and current_uri != index_uri:
+            if use_directory_urls:
+                cur_html_dir = os.path.dirname(current_uri).replace(os.sep, "/")
+                cur_html_dir += "/" + os.path.splitext(os.path.basename(current_uri))[0]
+                idx_html_dir = os.path.dirname(index_uri).replace(os.sep, "/")
+                rel = os.path.relpath(idx_html_dir, cur_html_dir).replace(os.sep, "/")
+                if not rel.endswith("/"):
+                    rel += "/"
+            else:
+                target_html = index_uri.replace(".md", ".html")
+                cur_dir = os.path.dirname(current_uri)
+                rel = os.path.relpath(target_html, cur_dir).replace(os.sep, "/")
+            prefix = rel + "#"
+        href = '<a href="' + prefix
         parts = []
-        for ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+        for ch, inactive in self._AZ_INACTIVE.items():
             if ch in active:
-                if index_uri and current_uri and current_uri != index_uri:
-                    if use_directory_urls:
-                        cur_html_dir = os.path.dirname(current_uri).replace(os.sep, "/")
-                        cur_html_dir += "/" + os.path.splitext(os.path.basename(current_uri))[0]
-                        idx_html_dir = os.path.dirname(index_uri).replace(os.sep, "/")
-                        rel = os.path.relpath(idx_html_dir, cur_html_dir).replace(os.sep, "/")
-                        if not rel.endswith("/"):
-                            rel += "/"
-                    else:
-                        target_html = index_uri.replace(".md", ".html")
-                        cur_dir = os.path.dirname(current_uri)
-                        rel = os.path.relpath(target_html, cur_dir).replace(os.sep, "/")
-                    parts.append(f'<a href="{rel}#{ch}">{ch}</a>')
-                else:
-                    parts.append(f'<a href="#{ch}">{ch}</a>')
+                parts.append(href + ch + '">' + ch + "</a>")
             else:
-                parts.append(f'<span class="x">{ch}</span>')
+                parts.append(inactive)
         return self._AZ_CSS + '\n<div class="hm-idx">\n' + "\n".join(parts) + "\n</div>\n\n"
 
     # ── Page rendering ──
@@ -1062,6 +1317,17 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
             language="cpp" if domain == "cpp" else "c",
         )
 
+    def _page_uri(self, abspath):
+        """Return the first page uri generated for the source abspath, or None."""
+        uri = self._page_uris.get(abspath)
+        if uri is not None and self._pages.get(uri, (None,))[0] == abspath:
+            return uri
+        # Pages added behind _discover_and_register's back
+        for uri, (path, _) in self._pages.items():
+            if path == abspath:
+                return uri
+        return None
+
     def _mk_page(self, abspath, group):
         rel = os.path.relpath(abspath, group.root)
         docs = self._parse(abspath, group)
@@ -1069,11 +1335,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
         cfg = self._rcfg("cpp" if ext.lower() in _CPP_EXTS else "c")
         cfg.heading_level = 2
 
-        page_uri = None
-        for uri, (path, _) in self._pages.items():
-            if path == abspath:
-                page_uri = uri
-                break
+        page_uri = self._page_uri(abspath)
         index_uri = f"{group.output_dir}/index.md"
         bar = self._az_bar(
             group, index_uri=index_uri, current_uri=page_uri, use_directory_urls=self._use_dir_urls
@@ -1089,7 +1351,8 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
             rendered = render_doc(doc, cfg)
             if doc.kind in (SymbolKind.FUNCTION, SymbolKind.MACRO_FUNCTION):
                 # Check if renderer already emitted HowTo/Notes from comment
-                has_comment_appendix = "<!-- APPENDIX_RENDER_START -->" in rendered
+                start = rendered.find(_APPENDIX_START)
+                has_comment_appendix = start != -1
                 code_appendix = ""
                 if self.config["appendix_code_usages"]:
                     code_appendix = self._render_appendix(doc.name, group)
@@ -1100,12 +1363,15 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
 
                     # Extract HowTo/Notes from rendered markdown
                     if has_comment_appendix:
-                        _, _, rest = rendered.partition("<!-- APPENDIX_RENDER_START -->")
-                        comment_appendix, _, after = rest.partition("<!-- APPENDIX_RENDER_END -->")
+                        body = start + len(_APPENDIX_START)
+                        end = rendered.find(_APPENDIX_END, body)
+                        if end == -1:
+                            comment_appendix, after = rendered[body:], ""
+                        else:
+                            comment_appendix = rendered[body:end]
+                            after = rendered[end + len(_APPENDIX_END) :]
                         # Remove markers from rendered
-                        rendered = (
-                            rendered[: rendered.index("<!-- APPENDIX_RENDER_START -->")] + after
-                        )
+                        rendered = rendered[:start] + after
                         appendix_parts.append(comment_appendix.strip())
                         appendix_parts.append("")
 
@@ -1156,8 +1422,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
                 nsubs = sum(len(t.subtests) for t in g.test_metas.values())
                 desc = f" — {ntests} tests, {nsubs} subtests"
             else:
-                syms = {n: e for n, e in self._symbols.items() if e.group_title == g.nav_title}
-                desc = f" — {len(syms)} symbols"
+                desc = f" — {len(self._group_symbols(g))} symbols"
             lines.append(f"- **[{g.nav_title}]({link})** — {nfiles} files{desc}")
         lines.append("")
 
@@ -1253,8 +1518,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
                 lines.append("| File | Symbols |")
                 lines.append("|------|---------|")
             for rel in by_dir[d]:
-                uri = _source_rel_to_md_uri(rel, group.output_dir)
-                link = uri[len(group.output_dir) + 1 :]
+                link = _source_rel_to_md_link(rel)
                 fn = os.path.basename(rel)
                 if group.test_mode == "igt":
                     tmeta = group.test_metas.get(rel)
@@ -1275,7 +1539,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
         lines += ["---", "", "## Symbol Index", ""]
         syms = self._group_symbols(group)
         by_letter = {}
-        for name, entry in sorted(syms.items()):
+        for name, entry in syms.items():
             if not name:
                 continue
             if "@" in name or "/" in name:
@@ -1287,7 +1551,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
             if not sort_name or not sort_name[0].isalpha():
                 continue
             letter = sort_name[0].upper()
-            by_letter.setdefault(letter, []).append((name, entry))
+            by_letter.setdefault(letter, []).append((sort_name.lower(), name, entry))
 
         from .renderer import _KIND_LABELS
 
@@ -1300,7 +1564,9 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
             if not entries:
                 lines += ["*No symbols.*", ""]
                 continue
-            for name, entry in sorted(entries, key=lambda x: x[0].lstrip("_").lower()):
+            # Names are unique, so (sort key, name) orders every entry
+            entries.sort(key=itemgetter(0, 1))
+            for _, name, entry in entries:
                 kind_label = _KIND_LABELS.get(entry.kind, "")
                 page_link = entry.page_uri[len(group.output_dir) + 1 :]
                 display = (
@@ -1320,11 +1586,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
         cfg = self._rcfg("cpp" if ext.lower() in _CPP_EXTS else "c")
         cfg.heading_level = 3
 
-        page_uri = None
-        for uri, (path, _) in self._pages.items():
-            if path == abspath:
-                page_uri = uri
-                break
+        page_uri = self._page_uri(abspath)
         index_uri = f"{group.output_dir}/index.md"
         bar = self._az_bar(
             group, index_uri=index_uri, current_uri=page_uri, use_directory_urls=self._use_dir_urls
@@ -1450,32 +1712,21 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
     @staticmethod
     def _get_field(fields, name, default=None):
         """Look up a field with flexible name matching (underscore/hyphen/space)."""
-        if name in fields:
-            return fields[name]
-        # Try alternate forms: sub_category <-> sub-category <-> Sub category
-        alt_hyphen = name.replace("_", "-")
-        if alt_hyphen in fields:
-            return fields[alt_hyphen]
-        alt_under = name.replace("-", "_")
-        if alt_under in fields:
-            return fields[alt_under]
-        alt_space = name.replace("_", " ")
-        if alt_space in fields:
-            return fields[alt_space]
-        alt_space2 = name.replace("-", " ")
-        if alt_space2 in fields:
-            return fields[alt_space2]
+        for key in _field_keys(name):
+            if key in fields:
+                return fields[key]
         return default
 
     def _is_subtest_field(self, group, field_name):
         """Check if field_name is primarily a subtest-level field."""
+        get_field = self._get_field
         test_hits = 0
         sub_hits = 0
-        for rel, tmeta in group.test_metas.items():
-            if self._get_field(tmeta.fields, field_name) is not None:
+        for tmeta in group.test_metas.values():
+            if get_field(tmeta.fields, field_name) is not None:
                 test_hits += 1
             for sub in tmeta.subtests:
-                if self._get_field(sub.fields, field_name) is not None:
+                if get_field(sub.fields, field_name) is not None:
                     sub_hits += 1
         return sub_hits > test_hits
 
@@ -1501,8 +1752,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
             lines.append(f"*{len(entries)} tests, {sub_count} subtests*")
             lines.append("")
             for rel, tmeta in sorted(entries, key=lambda x: x[1].name.lower()):
-                uri = _source_rel_to_md_uri(rel, group.output_dir)
-                link = uri[len(group.output_dir) + 1 :]
+                link = _source_rel_to_md_link(rel)
                 test_desc = self._get_field(tmeta.fields, "description", "")
                 lines.append(f"### [{tmeta.name}]({link}#test-{tmeta.name})")
                 lines.append("")
@@ -1551,8 +1801,7 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
             for (rel, tname), (tmeta, subs) in sorted(
                 by_test.items(), key=lambda x: x[0][1].lower()
             ):
-                uri = _source_rel_to_md_uri(rel, group.output_dir)
-                link = uri[len(group.output_dir) + 1 :]
+                link = _source_rel_to_md_link(rel)
                 lines.append(f"### [{tmeta.name}]({link}#test-{tmeta.name})")
                 lines.append("")
                 lines.append("| Subtest | Description |")
@@ -1566,25 +1815,101 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
 
         return lines
 
+    def _backends(self):
+        """Return (use_clang, use_regex) for the configured parser mode."""
+        parser_mode = self.config.get("parser", "auto")
+        use_clang = CLANG_AVAILABLE and parser_mode in ("auto", "clang")
+        use_regex = parser_mode == "regex" or (not use_clang and self.config["fallback_parser"])
+        return use_clang, use_regex
+
+    def _prefetch(self, paths, group):
+        """Parse paths in parallel ahead of _parse (and _parse_test for IGT groups)."""
+        if group.test_mode == "igt":
+            results = parse_igt_test_files(
+                [p for p in paths if self._is_source_file(p)],
+                extract_steps=group.extract_test_steps,
+                workers=self.config.get("parse_jobs", 1),
+            )
+            for path, tmeta, exc in results:
+                self._prefetched[("igt", path)] = (tmeta, exc)
+
+        use_clang, use_regex = self._backends()
+        if not use_clang and not use_regex:
+            return
+        backend = parse_file if use_clang else parse_file_regex
+        todo = [
+            p
+            for p in paths
+            if p not in self._cache
+            and self._is_source_file(p)
+            and not self._parse_cached(backend, p, group.clang_args)
+        ]
+        results = parse_files(
+            todo,
+            clang_args=group.clang_args,
+            use_clang=use_clang,
+            workers=self.config.get("parse_jobs", 1),
+        )
+        for path, docs, exc in results:
+            self._prefetched[(backend, path)] = (docs, exc)
+
+    def _parse_test(self, abspath, group):
+        pre = self._prefetched.pop(("igt", abspath), None)
+        if pre is None:
+            return parse_igt_test_file(abspath, extract_steps=group.extract_test_steps)
+        tmeta, exc = pre
+        if exc is not None:
+            raise exc
+        return tmeta
+
+    def _source_stamp(self, abspath):
+        """Return the (mtime_ns, size) of abspath, reusing the discovery walk's stat."""
+        stamp = self._stamps.get(abspath)
+        return stamp if stamp is not None else _file_stamp(abspath)
+
+    def _is_source_file(self, abspath):
+        return abspath in self._stamps or os.path.isfile(abspath)
+
+    def _parse_cached(self, backend, abspath, clang_args=None):
+        """Return True if backend's result for abspath is cached and still current."""
+        hit = _parse_cache.get(_parse_cache_key(backend, abspath, clang_args))
+        return hit is not None and hit[0] == self._source_stamp(abspath)
+
+    def _run_parser(self, backend, abspath, **kwargs):
+        key = _parse_cache_key(backend, abspath, kwargs.get("clang_args"))
+        stamp = self._source_stamp(abspath)
+        pre = self._prefetched.pop((backend, abspath), None)
+        hit = _parse_cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        if pre is None:
+            docs = backend(abspath, **kwargs)
+        else:
+            docs, exc = pre
+            if exc is not None:
+                raise exc
+        if stamp is not None:
+            # Shared with later builds as is: parsed docs are never modified
+            _parse_cache[key] = (stamp, docs)
+        return docs
+
     def _parse(self, filepath, group=None):
         abspath = os.path.normpath(filepath)
         if abspath in self._cache:
             return self._cache[abspath]
-        if not os.path.isfile(abspath):
+        if not self._is_source_file(abspath):
             log.error("cdoc: file not found: %s", abspath)
             return []
 
         clang_args = group.clang_args if group else self.config["clang_args"]
 
         docs = []
-        parser_mode = self.config.get("parser", "auto")
-        use_clang = CLANG_AVAILABLE and parser_mode in ("auto", "clang")
-        use_regex = parser_mode == "regex" or (not use_clang and self.config["fallback_parser"])
+        use_clang, use_regex = self._backends()
         need_fallback = not use_clang
 
         if use_clang:
             try:
-                docs = parse_file(abspath, clang_args=clang_args)
+                docs = self._run_parser(parse_file, abspath, clang_args=clang_args)
             except Exception as exc:
                 if self.config["fallback_parser"]:
                     log.debug(
@@ -1598,12 +1923,12 @@ background:var(--md-code-bg-color,#f5f5f5);border-radius:3px}
 
         if need_fallback and (use_regex or self.config["fallback_parser"]):
             try:
-                docs = parse_file_regex(abspath)
+                docs = self._run_parser(parse_file_regex, abspath)
             except Exception as exc:
                 log.error("cdoc: regex fallback failed for %s: %s", abspath, exc)
                 docs = []
 
-        self._convert_comments(docs)
+        docs = self._convert_comments(docs)
         self._cache[abspath] = docs
         return docs
 
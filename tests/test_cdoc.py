@@ -1,4 +1,5 @@
 import os
+import sys
 import textwrap
 import pytest
 
@@ -184,6 +185,62 @@ class TestRegexParser:
         docs = [d for d in parse_file_regex(str(self.source)) if d.name == "add"]
         assert len(docs) == 1 and "Add two" in docs[0].comment
 
+    def test_parse_files_parallel_matches_serial(self, tmp_path):
+        from mkdocs_cdoc.parser import _PARALLEL_MIN_FILES, parse_files
+
+        paths = [str(self.source)] * _PARALLEL_MIN_FILES + [str(tmp_path / "missing.c")]
+        serial = list(parse_files(paths, use_clang=False, workers=1))
+        parallel = list(parse_files(paths, use_clang=False, workers=2))
+        assert [(p, d) for p, d, _ in serial] == [(p, d) for p, d, _ in parallel]
+        assert serial[0][1] == parse_file_regex(str(self.source))
+        assert isinstance(parallel[-1][2], OSError) and parallel[-1][1] == []
+
+    def test_parse_files_falls_back_when_pool_fails(self, tmp_path, monkeypatch):
+        from concurrent.futures.process import BrokenProcessPool
+
+        import mkdocs_cdoc.parser as parser
+
+        paths = [str(self.source)] * parser._PARALLEL_MIN_FILES
+        serial = list(parser.parse_files(paths, use_clang=False, workers=1))
+
+        def no_pool(workers):
+            raise OSError("sem_open unavailable")
+
+        monkeypatch.setattr(parser, "_process_pool", no_pool)
+        assert list(parser.parse_files(paths, use_clang=False, workers=2)) == serial
+
+        class DyingPool(parser.ThreadPoolExecutor):
+            def map(self, fn, items, chunksize=1):
+                items = list(items)
+                yield fn(items[0])
+                raise BrokenProcessPool("worker died")
+
+        monkeypatch.setattr(parser, "_process_pool", DyingPool)
+        assert list(parser.parse_files(paths, use_clang=False, workers=2)) == serial
+
+    def test_doc_marker_probe(self, tmp_path):
+        from mkdocs_cdoc.parser import _has_doc_markers
+
+        plain = tmp_path / "plain.c"
+        plain.write_text("/* not a doc comment */\nint x;\n")
+        qt = tmp_path / "qt.c"
+        qt.write_text("//! Qt-style doc.\nint y;\n")
+        assert _has_doc_markers(str(self.source))
+        assert _has_doc_markers(str(qt))
+        assert not _has_doc_markers(str(plain))
+
+    def test_mapped_scan_matches_text_scan(self, tmp_path, monkeypatch):
+        import mkdocs_cdoc.parser as parser
+
+        crlf = tmp_path / "crlf.c"
+        crlf.write_bytes(self.source.read_bytes().replace(b"\n", b"\r\n"))
+        expected = parse_file_regex(str(self.source))
+        monkeypatch.setattr(parser, "_MMAP_MIN_SIZE", 1)
+        assert parse_file_regex(str(self.source)) == expected
+        assert parse_file_regex(str(crlf)) == [
+            DocComment(**{**vars(d), "filename": "crlf.c"}) for d in expected
+        ]
+
 
 # -- renderer --
 
@@ -298,10 +355,24 @@ class TestDiscoverSources:
         found = _discover_sources(self._tree(tmp_path), [".c", ".h"], ["test_*"])
         assert "test_foo.c" not in {os.path.basename(f) for f in found}
 
+    def test_exclude_relative_path_and_order(self, tmp_path):
+        root = self._tree(tmp_path)
+        found = _discover_sources(root, ["c", ".h"], ["lib/*.h", "*.txt"])
+        assert found == ["main.c", "test_foo.c", os.path.join("lib", "core.c")]
+
     def test_empty(self, tmp_path):
         (tmp_path / "empty").mkdir()
         assert _discover_sources(str(tmp_path / "empty"), [".c"], []) == []
 
+    def test_records_stamps(self, tmp_path):
+        root = self._tree(tmp_path)
+        stamps = {}
+        found = _discover_sources(root, [".c"], ["test_*"], stamps)
+        paths = [os.path.normpath(os.path.join(root, rel)) for rel in found]
+        assert sorted(stamps) == sorted(paths)
+        st = os.stat(paths[0])
+        assert stamps[paths[0]] == (st.st_mtime_ns, st.st_size)
+
 
 # -- URI mapping --
 
@@ -709,6 +780,27 @@ class TestGtkdocRuntime:
         docs = plugin._parse(str(src))
         assert not any(":func:`foo`" in d.comment for d in docs)
 
+    def test_reparse_uses_fresh_results(self, tmp_path):
+        src = tmp_path / "test.c"
+        src.write_text("/**\n * Call foo() on #MyStruct\n */\nvoid bar();\n")
+
+        def parse(convert):
+            plugin = CdocPlugin()
+            plugin.config = {"source_root": str(tmp_path), "sources": [], **_rcfg()}
+            plugin.config["convert_gtkdoc"] = convert
+            return plugin._parse(str(src))
+
+        assert any(":func:`foo`" in d.comment for d in parse(True))
+        # A cached result must not carry the previous build's conversion
+        assert not any(":func:`foo`" in d.comment for d in parse(False))
+
+        # Same size as before; move the mtime on explicitly so coarse
+        # filesystem timestamps can't make the rewrite look unchanged
+        st = os.stat(src)
+        src.write_text("/**\n * Call baz() on #MyStruct\n */\nvoid qux();\n")
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert [d.name for d in parse(False)] == ["qux"]
+
 
 # -- build groups --
 
@@ -894,6 +986,22 @@ class TestAlphabetBar:
         driver_active = p._active_letters(p._groups[1])
         assert core_active != driver_active
 
+    def test_active_letters_follow_registration(self, tmp_path):
+        p = _mk_single(tmp_path)
+        g = p._groups[0]
+        assert "Z" not in p._active_letters(g)
+        doc = DocComment(name="zap", kind=SymbolKind.FUNCTION, comment="")
+        p._register_symbols([doc], "api/main.c.md", g)
+        assert "Z" in p._active_letters(g)
+        assert '<a href="#Z">Z</a>' in p._az_bar(g)
+
+    def test_file_symbol_registration_refreshes_buckets(self, tmp_path):
+        p = _mk_single(tmp_path)
+        g = p._groups[0]
+        assert "extra.c" not in p._group_symbols(g)
+        p._register_file_symbol("extra.c", "api/extra.c.md", g)
+        assert p._group_symbols(g)["extra.c"].kind == SymbolKind.FILE
+
 
 # -- IGT test mode --
 
@@ -963,6 +1071,91 @@ class TestIGTParser:
         assert "from-comment" in names
         assert "from-code" in names
 
+    def test_multiline_field_values(self, tmp_path):
+        src = tmp_path / "multi.c"
+        src.write_text(
+            "/**\n * TEST: multi\n * Description:\n *   First line\n *   second line\n *\n"
+            " * SUBTEST: one\n * Description:\n *   Sub line\n *   more\n */\n\n"
+            "/**\n * SUBTEST: two\n * Description:\n *   Standalone\n *   text\n */\n"
+        )
+        tm = parse_igt_test_file(str(src))
+        assert tm.fields["description"] == "First line second line"
+        subs = {s.name: s for s in tm.subtests}
+        assert subs["one"].fields["description"] == "Sub line more"
+        assert subs["two"].fields["description"] == "Standalone text"
+
+    def test_reparse_tracks_file_changes(self, tmp_path):
+        src = tmp_path / "cached.c"
+        src.write_text("/**\n * TEST: cached\n * Category: Core\n */\n")
+        tm = parse_igt_test_file(str(src))
+        tm.fields["category"] = "Mutated"
+        assert parse_igt_test_file(str(src)).fields["category"] == "Core"
+
+        src.write_text("/**\n * TEST: cached\n * Category: Display\n */\n")
+        assert parse_igt_test_file(str(src)).fields["category"] == "Display"
+
+    def test_parse_test_files_parallel_matches_serial(self, tmp_path):
+        import mkdocs_cdoc.parser as parser
+
+        paths = []
+        for i in range(parser._PARALLEL_MIN_FILES):
+            src = tmp_path / f"t{i}.c"
+            src.write_text(
+                f'/**\n * TEST: t{i}\n */\nigt_subtest("s{i}") {{\n\tigt_assert(x);\n}}\n'
+            )
+            paths.append(str(src))
+        paths.append(str(tmp_path / "missing.c"))
+        parallel = list(parser.parse_igt_test_files(paths, workers=2))
+        parser._igt_cache.clear()
+        serial = list(parser.parse_igt_test_files(paths, workers=1))
+        assert [(p, t) for p, t, _ in parallel] == [(p, t) for p, t, _ in serial]
+        assert parallel[3][1] == parse_igt_test_file(paths[3])
+        assert parallel[-1][1] is None and isinstance(parallel[-1][2], OSError)
+
+    def test_parse_test_files_falls_back_when_pool_fails(self, tmp_path, monkeypatch):
+        import mkdocs_cdoc.parser as parser
+
+        paths = []
+        for i in range(parser._PARALLEL_MIN_FILES):
+            src = tmp_path / f"t{i}.c"
+            src.write_text(f"/**\n * TEST: t{i}\n */\n")
+            paths.append(str(src))
+
+        def no_pool(workers):
+            raise OSError("sem_open unavailable")
+
+        monkeypatch.setattr(parser, "_process_pool", no_pool)
+        results = list(parser.parse_igt_test_files(paths, workers=2))
+        assert [t.name for _, t, _ in results] == [f"t{i}" for i in range(len(paths))]
+        assert all(exc is None for _, _, exc in results)
+
+    def test_mapped_read_matches_text_read(self, tmp_path, monkeypatch):
+        import mkdocs_cdoc.parser as parser
+
+        text = (
+            "/**\n * TEST: mapped\n * Description: Multi\n *  line\n */\n\n"
+            'igt_describe("Does it.");\nigt_subtest("go") {\n\tigt_assert(x);\n}\n'
+        )
+        src = tmp_path / "mapped.c"
+        src.write_text(text)
+        crlf = tmp_path / "crlf.c"
+        crlf.write_bytes(text.encode().replace(b"\n", b"\r\n"))
+        plain = tmp_path / "plain.c"
+        plain.write_text("int main(void) { return 0; }\n")
+
+        expected = parser._parse_igt_test_file(str(src), True)
+        monkeypatch.setattr(parser, "_MMAP_MIN_SIZE", 1)
+        assert parser._parse_igt_test_file(str(src), True) == expected
+        got = parser._parse_igt_test_file(str(crlf), True)
+        assert (got.name, got.fields, got.subtests) == (
+            expected.name,
+            expected.fields,
+            expected.subtests,
+        )
+        assert parser._parse_igt_test_file(str(plain), True) == IGTTestMeta(
+            name="plain", filename="plain.c"
+        )
+
 
 class TestIGTPlugin:
     def _mk_igt(self, tmp_path):
@@ -1385,6 +1578,22 @@ class TestRenderingFixes:
         result = rst_to_markdown("Resets.", doc=doc)
         assert "Returns" not in result
 
+    def test_code_usages_skip_definitions_and_comments(self, tmp_path):
+        plugin = _mk_single(tmp_path)
+        g = plugin._groups[0]
+        (tmp_path / "src" / "use.c").write_text(
+            "int g(void)\n{\n\treturn 0;\n}\n"
+            "/* g(); */\n"
+            "// g();\n"
+            "void caller(void)\n{\n\tint x = g();\n\tf(x);\n}\n"
+        )
+        g.discovered.append("use.c")
+        usages = plugin._extract_code_usages("g", g)
+        assert [(rel, line) for rel, line, _ in usages] == [("use.c", 7)]
+        assert "int x = g();" in "\n".join(usages[0][2])
+        assert plugin._extract_code_usages("f", g)[0][:2] == ("use.c", 7)
+        assert plugin._extract_code_usages("missing", g) == []
+
 
 class TestMultipleExamples:
     def test_two_examples_extracted(self):
@@ -1556,3 +1765,152 @@ class TestSubtestStepExtraction:
         body = _extract_brace_body(source, source.index("{"))
         assert "bar()" in body
         assert "baz()" in body
+
+    def test_extract_brace_body_nested_and_unbalanced(self):
+        from mkdocs_cdoc.parser import _extract_brace_body
+
+        source = "x { if (a) { b(); } { } c(); } tail }"
+        assert _extract_brace_body(source, 2) == " if (a) { b(); } { } c(); "
+        assert _extract_brace_body("x { if (a) { b(); }", 2) == ""
+
+
+# -- gtk-doc batch conversion --
+
+
+class TestConvert:
+    def _tree(self, tmp_path):
+        (tmp_path / "a.c").write_text("/**\n * Call foo() with %TRUE.\n */\nvoid a(void);\n")
+        (tmp_path / "b.h").write_text("/* plain comment */\nint b;\n")
+        (tmp_path / "c.c").write_text("/**\n * See #Widget.\n */\nvoid c(void);\n")
+        return tmp_path
+
+    def test_convert_file(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        root = self._tree(tmp_path)
+        assert convert_file(str(root / "a.c"))
+        text = (root / "a.c").read_text()
+        assert ":func:`foo`" in text and ":const:`TRUE`" in text
+        assert not convert_file(str(root / "b.h"))
+
+    def test_convert_file_dry_run(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        root = self._tree(tmp_path)
+        before = (root / "a.c").read_text()
+        assert convert_file(str(root / "a.c"), dry_run=True)
+        assert (root / "a.c").read_text() == before
+
+    def test_convert_all_parallel_matches_serial(self, tmp_path):
+        from mkdocs_cdoc.convert import _PARALLEL_MIN_FILES, _convert_all
+
+        root = self._tree(tmp_path)
+        files = [str(root / n) for n in ("a.c", "b.h", "c.c")] * _PARALLEL_MIN_FILES
+        serial = list(_convert_all(files, dry_run=True, jobs=1))
+        parallel = list(_convert_all(iter(files), dry_run=True, jobs=2))
+        assert serial == parallel
+        assert [changed for _, changed in serial[:3]] == [True, False, True]
+
+    def test_convert_all_falls_back_when_pool_fails(self, tmp_path, monkeypatch):
+        import mkdocs_cdoc.convert as convert
+
+        root = self._tree(tmp_path)
+        files = [str(root / n) for n in ("a.c", "b.h", "c.c")] * convert._PARALLEL_MIN_FILES
+        serial = list(convert._convert_all(files, dry_run=True, jobs=1))
+
+        def no_pool(workers):
+            raise OSError("sem_open unavailable")
+
+        monkeypatch.setattr(convert, "_process_pool", no_pool)
+        assert list(convert._convert_all(files, dry_run=True, jobs=2)) == serial
+
+    def test_iter_files_filters_extensions(self, tmp_path):
+        from mkdocs_cdoc.convert import _iter_files
+
+        root = self._tree(tmp_path)
+        (root / "notes.txt").write_text("/** not C */")
+        found = {os.path.basename(p) for p in _iter_files(str(root), {".c"})}
+        assert found == {"a.c", "c.c"}
+
+    def test_convert_file_skips_files_without_doc_blocks(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        (tmp_path / "empty.c").write_text("")
+        assert not convert_file(str(tmp_path / "empty.c"))
+        assert not convert_file(str(self._tree(tmp_path) / "b.h"))
+
+    def test_convert_file_keeps_line_endings(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        path = tmp_path / "crlf.c"
+        path.write_bytes(b"/**\r\n * Call foo().\r\n */\r\nvoid f(void);\r\n")
+        assert convert_file(str(path))
+        assert path.read_bytes() == b"/**\r\n * Call :func:`foo`.\r\n */\r\nvoid f(void);\r\n"
+
+    def test_convert_text_adjacent_blocks(self):
+        from mkdocs_cdoc.convert import convert_text
+
+        # The "/" closing the first block must not open a second one
+        assert convert_text("/** a() */** b() */") == "/** :func:`a` */** b() */"
+        assert convert_text("/** a() *//** b() */") == "/** :func:`a` *//** :func:`b` */"
+        assert convert_text("/**/ x() */") == "/**/ :func:`x` */"
+        assert convert_text("/** unterminated x()") == "/** unterminated x()"
+
+    def test_convert_file_replaces_atomically(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        root = self._tree(tmp_path)
+        path = root / "a.c"
+        path.chmod(0o640)
+        link = root / "link.c"
+        link.symlink_to(path)
+        assert convert_file(str(link), backup=True)
+        assert link.is_symlink()
+        assert ":func:`foo`" in path.read_text()
+        assert (path.stat().st_mode & 0o777) == 0o640
+        assert "foo()" in (root / "link.c.bak").read_text()
+        assert not list(root.glob(".cdoc-*"))
+
+    def test_backup_survives_rewrite(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        root = self._tree(tmp_path)
+        (root / "a.c.bak").write_text("stale")
+        assert convert_file(str(root / "a.c"), backup=True)
+        assert "foo()" in (root / "a.c.bak").read_text()
+        assert ":func:`foo`" in (root / "a.c").read_text()
+
+    def test_skip_cached_matches_stat(self, tmp_path):
+        from mkdocs_cdoc.convert import _skip_cached
+
+        root = self._tree(tmp_path)
+        files = [str(root / n) for n in ("a.c", "b.h")]
+        stats, hits = {}, []
+        assert list(_skip_cached(files, {}, stats, hits)) == files
+        cache = {files[1]: stats[files[1]]}
+        stats, hits = {}, []
+        assert list(_skip_cached(files, cache, stats, hits)) == files[:1]
+        assert hits == files[1:]
+        (root / "b.h").write_text("/** edited */\n")
+        assert list(_skip_cached(files, cache, {}, [])) == files
+
+    def test_main_reports_in_sorted_order(self, tmp_path, monkeypatch, capsys):
+        from mkdocs_cdoc import convert
+
+        root = self._tree(tmp_path)
+        (root / "sub").mkdir()
+        (root / "sub" / "d.c").write_text("/** Uses bar(). */\n")
+        monkeypatch.setattr(sys, "argv", ["convert", str(root), "--dry-run", "-j", "1"])
+        convert.main()
+        lines = [ln for ln in capsys.readouterr().out.splitlines() if ln.startswith("[dry-run]")]
+        assert lines == sorted(lines) and len(lines) == 3
+
+    def test_convert_file_keeps_undecodable_bytes(self, tmp_path):
+        from mkdocs_cdoc.convert import convert_file
+
+        path = tmp_path / "latin1.c"
+        path.write_bytes(b"/* caf\xe9 */\n/** Call foo(). */\n/** na\xefve */\nint x;\n")
+        assert convert_file(str(path))
+        assert path.read_bytes() == (
+            b"/* caf\xe9 */\n/** Call :func:`foo`. */\n/** na\xefve */\nint x;\n"
+        )